@@ -0,0 +1,52 @@
+# Сравнение ChordIndex.containing с полным перебором аккордов:
+#     python -m src.bench.chord_index
+import random
+import timeit
+
+from src.core.chord import MajorTriad, MinorTriad
+from src.core.chord_index import ChordIndex
+from src.core.pitch_class_set import PitchClassSet
+
+
+class _SyntheticChord:
+
+    def __init__(self, mask: int):
+        self.pitch_class_set = PitchClassSet(mask)
+
+
+def _vocabulary(size: int, rnd: random.Random) -> list:
+    chords = MajorTriad.circle() + MinorTriad.circle()
+    while len(chords) < size:
+        intervals = [0] + rnd.sample(range(1, 12), rnd.randint(2, 5))
+        mask = 0
+        for interval in intervals:
+            mask |= 1 << interval
+        chords.extend(_SyntheticChord(PitchClassSet(mask).transpose(root).mask) for root in range(12))
+    return chords[:size]
+
+
+def _scan(chords: list, tones: PitchClassSet) -> list:
+    mask = tones.mask
+    return [c for c in chords if mask & c.pitch_class_set.mask == mask]
+
+
+def main() -> None:
+    rnd = random.Random(0)
+    queries = [PitchClassSet(rnd.getrandbits(12) & rnd.getrandbits(12)) for _ in range(1000)]
+
+    print(f"{'chords':>8} {'scan, us':>10} {'index, us':>10} {'speedup':>8}")
+    for size in (24, 288, 1200):
+        chords = _vocabulary(size, rnd)
+        index = ChordIndex(chords)
+        assert all(set(index.containing(q)) == set(_scan(chords, q)) for q in queries)
+
+        number = 20
+        scan_time = timeit.timeit(lambda: [_scan(chords, q) for q in queries], number=number)
+        index_time = timeit.timeit(lambda: [index.containing(q) for q in queries], number=number)
+        scan_us = scan_time / number / len(queries) * 1e6
+        index_us = index_time / number / len(queries) * 1e6
+        print(f"{size:>8} {scan_us:>10.2f} {index_us:>10.3f} {scan_us / index_us:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+# Скорость разбора обозначений аккордов: с LRU-кэшем и без него
+#     python -m src.bench.chord_symbol
+import random
+import timeit
+
+from src.core.chord import QUALITIES
+from src.core.chord_symbol import parse_symbol, parse_symbols
+from src.core.tone import TTR_FLAT, TTR_SHARP
+
+
+def _symbols(n: int, rnd: random.Random) -> list[str]:
+    # Словарь реального размера: все тона и типы, иногда с басом
+    vocabulary = [
+        root + q.suffix
+        for root in set(TTR_SHARP + TTR_FLAT)
+        for q in QUALITIES.values()
+    ]
+    vocabulary += [f"{symbol}/{rnd.choice(TTR_FLAT)}" for symbol in rnd.sample(vocabulary, 100)]
+    return [rnd.choice(vocabulary) for _ in range(n)]
+
+
+def main() -> None:
+    n = 200_000
+    symbols = _symbols(n, random.Random(0))
+    uncached = parse_symbol.__wrapped__
+
+    parse_symbol.cache_clear()
+    cold = timeit.timeit(lambda: [uncached(s) for s in symbols], number=1)
+    warm = timeit.timeit(lambda: parse_symbols(symbols), number=1)
+    print(f"table only:     {n / cold:>12,.0f} symbols/s")
+    print(f"table + cache:  {n / warm:>12,.0f} symbols/s")
+    print(parse_symbol.cache_info())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+# Страница Flet без клиента для бенчмарков: настоящий ft.Page поверх соединения,
+# которое превращает команды в сообщения клиенту так же, как локальный сервер Flet
+# (с выдачей id добавленным контролам), и вместо отправки считает их размер
+from __future__ import annotations
+import json
+from typing import List
+
+import flet as ft
+from flet_core.local_connection import LocalConnection
+from flet_core.protocol import (
+    ClientActions,
+    ClientMessage,
+    Command,
+    CommandEncoder,
+    PageCommandsBatchResponsePayload
+)
+
+
+class RecordingConnection(LocalConnection):
+
+    def __init__(self):
+        super(RecordingConnection, self).__init__()
+        self.messages = 0
+        self.controls_added = 0
+        self.payload_bytes = 0
+
+    def send_commands(self, session_id: str, commands: List[Command]) -> PageCommandsBatchResponsePayload:
+        results = []
+        messages = []
+        for command in commands:
+            result, message = self._process_command(command)
+            if command.name in ("add", "get"):
+                results.append(result)
+                self.controls_added += len(result.split())
+            if message:
+                messages.append(message)
+        if messages:
+            batch = ClientMessage(ClientActions.PAGE_CONTROLS_BATCH, messages)
+            self.payload_bytes += len(json.dumps(batch, cls=CommandEncoder, separators=(",", ":")))
+            self.messages += 1
+        return PageCommandsBatchResponsePayload(results=results, error="")
+
+    async def send_commands_async(self, session_id: str, commands: List[Command]) -> PageCommandsBatchResponsePayload:
+        return self.send_commands(session_id, commands)
+
+    def take_payload(self) -> int:
+        size, self.payload_bytes = self.payload_bytes, 0
+        return size
+
+
+def mock_page(connection: RecordingConnection, session_id: str = "bench") -> ft.Page:
+    return ft.Page(connection, session_id)
@@ -0,0 +1,25 @@
+# Отражение масок аккордов: по одной через PitchClassSet.invert и одним вызовом NumPy
+#     python -m src.bench.negative_harmony
+import timeit
+
+import numpy as np
+
+from src.core.negative_harmony import negative_mask, negative_masks
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for n in (10_000, 1_000_000):
+        masks = rng.integers(0, 4096, n)
+        tonics = rng.integers(0, 12, n)
+        pairs = list(zip(masks.tolist(), tonics.tolist()))
+        negative_masks(masks[:1], tonics[:1])  # таблица строится один раз
+
+        scalar = timeit.timeit(lambda: [negative_mask(m, t) for m, t in pairs], number=1)
+        vector = min(timeit.repeat(lambda: negative_masks(masks, tonics), number=1, repeat=5))
+        assert negative_masks(masks[:1000], tonics[:1000]).tolist() == [negative_mask(m, t) for m, t in pairs[:1000]]
+        print(f"{n:>9} chords: scalar {n / scalar / 1e6:6.2f} M/s, vectorized {n / vector / 1e6:7.1f} M/s")
+
+
+if __name__ == "__main__":
+    main()
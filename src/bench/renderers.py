@@ -0,0 +1,45 @@
+# Сравнение отрисовки круга контролами (Circle) и одним Canvas (CanvasCircle):
+# количество контролов в дереве и размер протокольных сообщений
+#     python -m src.bench.renderers
+from src.bench.mock_page import RecordingConnection, mock_page
+from src.core.circle_state import Mode
+from src.ui.base_circle import BaseCircle
+from src.ui.canvas_circle import CanvasCircle
+from src.ui.circle import Circle
+from src.ui.update_batch import UpdateBatch
+
+
+def _scenario(circle: BaseCircle, connection: RecordingConnection) -> list[tuple[str, int, int]]:
+    steps = [
+        ("click G", lambda: circle._on_chord_click(11)),
+        ("click G again", lambda: circle._on_chord_click(11)),
+        ("click Am", lambda: circle._on_chord_click(12)),
+        ("sharps", circle.set_sharps),
+        ("common notes", lambda: circle.set_mode(Mode.COMMON)),
+        ("click C", lambda: circle._on_chord_click(0)),
+        ("negative", lambda: circle.set_mode(Mode.NEGATIVE)),
+        ("click E", lambda: circle._on_chord_click(8))
+    ]
+    result = []
+    for name, step in steps:
+        messages = connection.messages
+        step()
+        result.append((name, connection.messages - messages, connection.take_payload()))
+    return result
+
+
+def main() -> None:
+    for renderer in (Circle, CanvasCircle):
+        connection = RecordingConnection()
+        circle = renderer(batch=UpdateBatch())
+        mock_page(connection).add(circle)
+        print(
+            f"{renderer.__name__}: {connection.controls_added} controls, "
+            f"initial payload {connection.take_payload()} bytes"
+        )
+        for name, messages, payload in _scenario(circle, connection):
+            print(f"  {name:<16} {messages} message(s), {payload:>6} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+# Воспроизведение журналов действий (src.utils.trace) против логики круга: headless
+# (только CircleState) и через отрисовщики с подмененной страницей Flet.
+# Результат сравнивается с сохраненным базовым, при регрессии код возврата 1
+#     python -m src.main --record-trace traces
+#     python -m src.bench.replay traces --save-baseline replay_baseline.json
+#     python -m src.bench.replay traces --baseline replay_baseline.json --threshold 0.25
+from __future__ import annotations
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from functools import partial
+from typing import Callable, Optional
+
+from src.core.circle_model import circle_model
+from src.core.circle_state import CircleState, Mode, Spelling
+from src.core.pitch_class_set import PitchClassSet
+from src.utils import trace
+
+# Метрики, по которым проверяется регрессия (меньше - лучше)
+GATED = ("mean_us", "p50_us", "bytes_per_event")
+
+
+def synthetic_trace(n: int = 500, seed: int = 0) -> list[trace.Event]:
+    # Журнал по умолчанию: в основном клики, иногда смена режима, написания и нот
+    rnd = random.Random(seed)
+    events = []
+    for i in range(n):
+        roll = rnd.random()
+        if roll < 0.6:
+            event = (trace.CLICK, rnd.randrange(24))
+        elif roll < 0.75:
+            event = (trace.MODE, rnd.choice(list(Mode)).name)
+        elif roll < 0.85:
+            event = (trace.SPELLING, rnd.choice(list(Spelling)).name)
+        elif roll < 0.98:
+            event = (trace.TONES, rnd.getrandbits(12) & rnd.getrandbits(12))
+        else:
+            event = (trace.RESIZE, rnd.choice((500, 600, 700)))
+        events.append((i * 100.0, *event))
+    return events
+
+
+def _apply_state(state: CircleState, kind: str, value) -> None:
+    if kind == trace.CLICK:
+        state.click(value)
+    elif kind == trace.MODE:
+        state.set_mode(Mode[value])
+    elif kind == trace.SPELLING:
+        state.set_spelling(Spelling[value])
+    elif kind == trace.TONES:
+        state.select(PitchClassSet(value))
+    # То, что читает отрисовщик после каждого события
+    state.labels()
+    state.tooltips()
+    state.colors()
+    state.highlighted()
+    state.tonics()
+
+
+def _apply_circle(circle, kind: str, value) -> None:
+    if kind == trace.CLICK:
+        circle._on_chord_click(value)
+    elif kind == trace.MODE:
+        circle.set_mode(Mode[value])
+    elif kind == trace.SPELLING:
+        if value == Spelling.SHARPS.name:
+            circle.set_sharps()
+        else:
+            circle.set_flats()
+    elif kind == trace.TONES:
+        circle.highlight_by_tones(PitchClassSet(value))
+    elif kind == trace.RESIZE:
+        circle.resize(value)
+
+
+def _percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def _measure(
+        runs: list[tuple[list[trace.Event], Callable[[str, object], None]]],
+        repeat: int,
+        payload: Optional[Callable[[], int]] = None
+) -> dict:
+    # runs - журналы с обработчиком для своего набора колец, задержки общие.
+    # Первый проход - прогрев, в замер не входит
+    for events, apply in runs:
+        for _, kind, value in events:
+            apply(kind, value)
+    if payload is not None:
+        payload()
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for events, apply in runs:
+            for _, kind, value in events:
+                t = time.perf_counter_ns()
+                apply(kind, value)
+                latencies.append((time.perf_counter_ns() - t) / 1000)
+    elapsed = time.perf_counter() - started
+
+    result = {
+        "events": len(latencies),
+        "throughput_eps": len(latencies) / elapsed if elapsed else float("inf"),
+        "mean_us": statistics.fmean(latencies) if latencies else float("nan"),
+        "p50_us": _percentile(latencies, 50),
+        "p99_us": _percentile(latencies, 99)
+    }
+    if payload is not None:
+        result["bytes_per_event"] = payload() / max(len(latencies), 1)
+    return result
+
+
+def _by_rings(traces: dict[str, list[trace.Event]]) -> dict[tuple[str, ...], list[trace.Event]]:
+    # Индексы кликов имеют смысл только для модели с теми же кольцами, что и при записи
+    groups: dict[tuple[str, ...], list[trace.Event]] = {}
+    for events in traces.values():
+        groups.setdefault(trace.rings_of(events), []).extend(e for e in events if e[1] != trace.RINGS)
+    return groups
+
+
+def _headless(groups: dict[tuple[str, ...], list[trace.Event]], repeat: int) -> dict:
+    runs = []
+    for rings, events in groups.items():
+        state = CircleState(circle_model(rings))
+        runs.append((events, partial(_apply_state, state)))
+    return _measure(runs, repeat)
+
+
+def _renderers(groups: dict[tuple[str, ...], list[trace.Event]], repeat: int) -> dict[str, dict]:
+    try:
+        from src.bench.mock_page import RecordingConnection, mock_page
+        from src.ui.canvas_circle import CanvasCircle
+        from src.ui.circle import Circle
+        from src.ui.update_batch import UpdateBatch
+    except ImportError:
+        print("flet is not installed, skipping renderers", file=sys.stderr)
+        return {}
+
+    results = {}
+    for name, renderer in (("controls", Circle), ("canvas", CanvasCircle)):
+        runs = []
+        # Обновления идут через настоящий page.update; размер считает соединение
+        connection = RecordingConnection()
+        for rings, events in groups.items():
+            circle = renderer(batch=UpdateBatch(), model=circle_model(rings))
+            mock_page(connection, session_id=f"{name}-{len(runs)}").add(circle)
+            runs.append((events, partial(_apply_circle, circle)))
+        results[name] = _measure(runs, repeat, payload=connection.take_payload)
+    return results
+
+
+def run(traces: dict[str, list[trace.Event]], repeat: int) -> dict:
+    groups = _by_rings(traces)
+    results = {"headless": _headless(groups, repeat)}
+    results.update(_renderers(groups, repeat))
+    return {"traces": {name: len(events) for name, events in traces.items()}, "results": results}
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list[str]:
+    if report["traces"] != baseline["traces"]:
+        print("warning: traces differ from the baseline", file=sys.stderr)
+    regressions = []
+    for runner, result in report["results"].items():
+        base = baseline["results"].get(runner)
+        if base is None:
+            continue
+        for metric in GATED:
+            if metric not in result or metric not in base:
+                continue
+            if result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{runner}.{metric}: {result[metric]:.2f} > {base[metric]:.2f} (+{threshold:.0%})"
+                )
+    return regressions
+
+
+def _print(report: dict) -> None:
+    print(f"{'runner':<10} {'events':>8} {'events/s':>10} {'mean, us':>9} {'p50, us':>8} {'p99, us':>8} {'bytes/event':>12}")
+    for runner, r in report["results"].items():
+        payload = f"{r['bytes_per_event']:>12.0f}" if "bytes_per_event" in r else f"{'-':>12}"
+        print(
+            f"{runner:<10} {r['events']:>8} {r['throughput_eps']:>10.0f} {r['mean_us']:>9.2f} "
+            f"{r['p50_us']:>8.2f} {r['p99_us']:>8.2f} {payload}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("traces", nargs="*", help="trace files or directories; a synthetic trace by default")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--baseline", metavar="FILE", help="fail if results regress past the threshold")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    parser.add_argument("--save-baseline", metavar="FILE")
+    args = parser.parse_args()
+
+    traces = trace.read_traces(args.traces) if args.traces else {"synthetic": synthetic_trace()}
+    report = run(traces, args.repeat)
+    _print(report)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print("OK")
+
+
+if __name__ == "__main__":
+    main()
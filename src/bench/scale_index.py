@@ -0,0 +1,29 @@
+# Поиск ладов, содержащих набор нот: по одной маске через SCALE_INDEX.containing и массивом масок
+#     python -m src.bench.scale_index
+import timeit
+
+import numpy as np
+
+from src.core.pitch_class_set import PitchClassSet
+from src.core.scale_index import SCALE_INDEX
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    for n in (10_000, 1_000_000):
+        masks = rng.integers(0, 4096, n)
+        sets = [PitchClassSet(m) for m in masks.tolist()]
+        SCALE_INDEX.classify(masks[:1])  # таблица строится один раз
+
+        scalar = timeit.timeit(lambda: [SCALE_INDEX.containing(s) for s in sets], number=1)
+        vector = min(timeit.repeat(lambda: SCALE_INDEX.match_counts(masks), number=1, repeat=5))
+        classify = min(timeit.repeat(lambda: SCALE_INDEX.classify(masks), number=1, repeat=5))
+        assert SCALE_INDEX.match_counts(masks[:1000]).tolist() == [len(SCALE_INDEX.containing(s)) for s in sets[:1000]]
+        print(
+            f"{n:>9} sets: scalar {n / scalar / 1e6:6.2f} M/s, "
+            f"counts {n / vector / 1e6:7.1f} M/s, classify {n / classify / 1e6:7.1f} M/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+# Память на одну сессию: сколько байт выделяется на состояние круга
+# (и на дерево контролов, если установлен Flet) сверх общих таблиц процесса
+#     python -m src.bench.session_memory
+import tracemalloc
+
+from src.core.circle_state import CircleState
+
+
+def _bytes_per_instance(factory, n: int) -> float:
+    factory()  # общие таблицы строятся при первом создании
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    instances = [factory() for _ in range(n)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    allocated = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    del instances
+    return allocated / n
+
+
+def main() -> None:
+    print(f"CircleState: {_bytes_per_instance(CircleState, 100_000):.0f} bytes/session")
+
+    try:
+        from src.ui.canvas_circle import CanvasCircle
+        from src.ui.circle import Circle
+    except ImportError:
+        print("flet is not installed, skipping control trees")
+        return
+    print(f"Circle: {_bytes_per_instance(Circle, 200):.0f} bytes/session")
+    print(f"CanvasCircle: {_bytes_per_instance(CanvasCircle, 200):.0f} bytes/session")
+
+
+if __name__ == "__main__":
+    main()
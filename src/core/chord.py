@@ -1,68 +1,190 @@
 from __future__ import annotations
-from abc import ABC, abstractmethod
+from typing import Callable, Iterable, Optional, Union
 
+from src.core.pitch_class_set import PitchClassSet
 from src.core.tone import Tone
 
 
-class Chord(ABC):
+class ChordQuality:
 
-    def __init__(self, root: Tone):
-        self.root = root
+    # Тип аккорда: интервалы от основного тона в полутонах и суффикс названия.
+    # Создается один раз на имя, см. QUALITY_TABLE и register_quality
+    __slots__ = ("name", "suffix", "intervals", "mask")
+
+    def __init__(self, name: str, suffix: str, intervals: tuple[int, ...]):
+        self.name = name
+        self.suffix = suffix
+        self.intervals = intervals
+        self.mask = PitchClassSet.of(Tone.by_idx(i) for i in intervals).mask
+
+    def __repr__(self):
+        return f"ChordQuality({self.name})"
+
+    def __reduce__(self):
+        return quality, (self.name,)
+
+
+# Имя, суффикс, интервалы от основного тона
+QUALITY_TABLE: tuple[tuple[str, str, tuple[int, ...]], ...] = (
+    ("maj", "", (0, 4, 7)),
+    ("min", "m", (0, 3, 7)),
+    ("dim", "dim", (0, 3, 6)),
+    ("aug", "aug", (0, 4, 8)),
+    ("sus2", "sus2", (0, 2, 7)),
+    ("sus4", "sus4", (0, 5, 7)),
+    ("6", "6", (0, 4, 7, 9)),
+    ("m6", "m6", (0, 3, 7, 9)),
+    ("7", "7", (0, 4, 7, 10)),
+    ("maj7", "maj7", (0, 4, 7, 11)),
+    ("m7", "m7", (0, 3, 7, 10)),
+    ("mmaj7", "m(maj7)", (0, 3, 7, 11)),
+    ("m7b5", "m7♭5", (0, 3, 6, 10)),
+    ("dim7", "dim7", (0, 3, 6, 9)),
+    ("aug7", "aug7", (0, 4, 8, 10)),
+    ("7sus4", "7sus4", (0, 5, 7, 10)),
+    ("add9", "add9", (0, 4, 7, 14)),
+    ("9", "9", (0, 4, 7, 10, 14)),
+    ("maj9", "maj9", (0, 4, 7, 11, 14)),
+    ("m9", "m9", (0, 3, 7, 10, 14))
+)
+
+QUALITIES: dict[str, ChordQuality] = {}
+
+# Вызываются для каждого нового типа: так индексы и таблицы, построенные
+# по уже известным типам (CHORD_INDEX, разбор символов), остаются полными
+_QUALITY_LISTENERS: list[Callable[[ChordQuality], None]] = []
+
+
+def register_quality(name: str, suffix: str, intervals: tuple[int, ...]) -> ChordQuality:
+    if name in QUALITIES:
+        raise ValueError(f"chord quality {name!r} is already registered")
+    chord_quality = QUALITIES[name] = ChordQuality(name, suffix, tuple(intervals))
+    for listener in _QUALITY_LISTENERS:
+        listener(chord_quality)
+    return chord_quality
+
+
+def on_quality_registered(listener: Callable[[ChordQuality], None]) -> None:
+    _QUALITY_LISTENERS.append(listener)
+
+
+def quality(name: str) -> ChordQuality:
+    try:
+        return QUALITIES[name]
+    except KeyError:
+        raise ValueError(f"unknown chord quality {name!r}") from None
+
+
+for _row in QUALITY_TABLE:
+    register_quality(*_row)
+
+
+class Chord:
+
+    # Аккорды неизменяемы и создаются один раз на процесс: Chord(root, quality)
+    # возвращает уже существующий экземпляр, общий для всех сессий.
+    # Ноты и названия считаются при создании
+    __slots__ = ("_root", "_quality", "_tones", "_pitch_class_set", "_sharp_name", "_flat_name")
+
+    # Подклассы закрепляют тип аккорда: MajorTriad(root) is Chord(root, "maj")
+    QUALITY: Optional[str] = None
+
+    _instances: dict[tuple[str, Tone], Chord] = {}
+    _classes: dict[str, type[Chord]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super(Chord, cls).__init_subclass__(**kwargs)
+        if cls.QUALITY is not None:
+            Chord._classes[cls.QUALITY] = cls
+
+    def __new__(cls, root: Tone, chord_quality: Union[str, ChordQuality, None] = None):
+        if isinstance(chord_quality, ChordQuality):
+            chord_quality = chord_quality.name
+        if cls.QUALITY is not None:
+            if chord_quality not in (None, cls.QUALITY):
+                raise ValueError(f"{cls.__name__} has quality {cls.QUALITY!r}, not {chord_quality!r}")
+            chord_quality = cls.QUALITY
+        elif chord_quality is None:
+            raise TypeError("Chord() requires a chord quality")
+
+        chord = Chord._instances.get((chord_quality, root))
+        if chord is None:
+            q = quality(chord_quality)
+            chord = object.__new__(Chord._classes.get(q.name, Chord))
+            chord._root = root
+            chord._quality = q
+            chord._tones = tuple(Tone.by_idx(root.idx + i) for i in q.intervals)
+            chord._pitch_class_set = PitchClassSet(q.mask).transpose(root.idx)
+            chord._sharp_name = root.sharp_name + q.suffix
+            chord._flat_name = root.flat_name + q.suffix
+            Chord._instances[(chord_quality, root)] = chord
+        return chord
+
+    def __reduce__(self):
+        return Chord, (self._root, self._quality.name)
+
+    def __eq__(self, other):
+        if not isinstance(other, Chord):
+            return NotImplemented
+        return self._quality is other._quality and self._root == other._root
+
+    def __hash__(self):
+        return hash((self._quality.name, self._root))
+
+    def __repr__(self):
+        return f"Chord({self._sharp_name})"
+
+    @property
+    def root(self) -> Tone:
+        return self._root
+
+    @property
+    def quality(self) -> ChordQuality:
+        return self._quality
 
     @property
-    @abstractmethod
     def sharp_name(self) -> str:
-        pass
+        return self._sharp_name
 
     @property
-    @abstractmethod
     def flat_name(self) -> str:
-        pass
+        return self._flat_name
 
-    @abstractmethod
     def tones(self) -> list[Tone]:
-        pass
+        return list(self._tones)
 
+    @property
+    def pitch_class_set(self) -> PitchClassSet:
+        return self._pitch_class_set
 
-class MajorTriad(Chord):
+    @staticmethod
+    def ring(chord_quality: str, offset: int = 0) -> list[Chord]:
+        # Кольцо круга: основные тона идут по квартам от C (C F B♭ ... G),
+        # offset сдвигает их относительно мажорного кольца (A минорного кольца стоит под C)
+        return [Chord(Tone.by_idx(5 * i + offset), chord_quality) for i in range(12)]
 
-    @property
-    def sharp_name(self) -> str:
-        return self.root.sharp_name
+    @staticmethod
+    def vocabulary(qualities: Optional[Iterable[str]] = None) -> list[Chord]:
+        # Все 12 основных тонов для каждого типа (по умолчанию - для всех зарегистрированных)
+        names = QUALITIES if qualities is None else qualities
+        return [Chord(root, name) for name in names for root in Tone.twelve_tone_row()]
 
-    @property
-    def flat_name(self) -> str:
-        return self.root.flat_name
 
-    def tones(self) -> list[Tone]:
-        root = self.root
-        third = Tone.by_idx(root.idx + 4)
-        fifth = Tone.by_idx(root.idx + 7)
-        return [root, third, fifth]
+class MajorTriad(Chord):
+
+    __slots__ = ()
+    QUALITY = "maj"
 
     @classmethod
     def circle(cls) -> list[MajorTriad]:
-        roots = ["C", "F", "A♯", "D♯", "G♯", "C♯", "F♯", "B", "E", "A", "D", "G"]
-        return [cls(Tone.by_name(root)) for root in roots]
+        return Chord.ring(cls.QUALITY, 0)
 
 
 class MinorTriad(Chord):
 
-    @property
-    def sharp_name(self) -> str:
-        return self.root.sharp_name + "m"
-
-    @property
-    def flat_name(self) -> str:
-        return self.root.flat_name + "m"
-
-    def tones(self) -> list[Tone]:
-        root = self.root
-        third = Tone.by_idx(root.idx + 3)
-        fifth = Tone.by_idx(root.idx + 7)
-        return [root, third, fifth]
+    __slots__ = ()
+    QUALITY = "min"
 
     @classmethod
     def circle(cls) -> list[MinorTriad]:
-        roots = ["A", "D", "G", "C", "F", "A♯", "D♯", "G♯", "C♯", "F♯", "B", "E"]
-        return [cls(Tone.by_name(root)) for root in roots]
+        return Chord.ring(cls.QUALITY, 9)
@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import Iterable
+
+from src.core.chord import Chord, ChordQuality, MajorTriad, MinorTriad, on_quality_registered
+from src.core.pitch_class_set import FULL_MASK, PitchClassSet
+
+
+class ChordIndex:
+
+    # Для каждой из 4096 масок хранит аккорды, содержащие все ее ноты
+    def __init__(self, chords: Iterable[Chord] = ()):
+        self._chords: list[Chord] = []
+        self._known: set[Chord] = set()
+        self._by_subset: list[tuple[Chord, ...]] = [() for _ in range(FULL_MASK + 1)]
+        self.add(*chords)
+
+    def __len__(self) -> int:
+        return len(self._chords)
+
+    @property
+    def chords(self) -> list[Chord]:
+        return list(self._chords)
+
+    def add(self, *chords: Chord) -> None:
+        by_subset = self._by_subset
+        for chord in chords:
+            # Повторная регистрация аккорда ничего не меняет
+            if chord in self._known:
+                continue
+            self._known.add(chord)
+            self._chords.append(chord)
+            mask = chord.pitch_class_set.mask
+            subset = mask
+            while True:
+                by_subset[subset] += (chord,)
+                if subset == 0:
+                    break
+                subset = (subset - 1) & mask
+
+    def containing(self, tones: PitchClassSet) -> tuple[Chord, ...]:
+        return self._by_subset[tones.mask]
+
+
+# Трезвучия круга идут первыми, дальше весь словарь зарегистрированных типов
+CHORD_INDEX = ChordIndex(MajorTriad.circle() + MinorTriad.circle() + Chord.vocabulary())
+
+
+def register_chords(chords: Iterable[Chord]) -> None:
+    CHORD_INDEX.add(*chords)
+
+
+def _on_quality(chord_quality: ChordQuality) -> None:
+    register_chords(Chord.vocabulary((chord_quality.name,)))
+
+
+on_quality_registered(_on_quality)
@@ -0,0 +1,139 @@
+from __future__ import annotations
+import re
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Optional
+
+from src.core.chord import QUALITIES, Chord, ChordQuality, on_quality_registered
+from src.core.tone import Tone
+
+# Разбор буквенно-цифровых обозначений аккордов: "F#m7b5", "B♭maj7/D", "Ebsus4".
+# Все сочетания "основной тон + суффикс" заранее сведены в одну таблицу,
+# так что разбор - это поиск по словарю (и LRU-кэш поверх него)
+
+_LETTERS = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+_ACCIDENTALS = {"": 0, "♯": 1, "#": 1, "♭": -1, "b": -1}
+
+# Дополнительные написания типов, кроме суффиксов из QUALITY_TABLE.
+# Суффиксы сравниваются после замены ♯/♭ на #/b
+SUFFIX_ALIASES: dict[str, str] = {
+    "M": "maj",
+    "maj": "maj",
+    "min": "min",
+    "-": "min",
+    "°": "dim",
+    "o": "dim",
+    "+": "aug",
+    "sus": "sus4",
+    "maj6": "6",
+    "min6": "m6",
+    "-6": "m6",
+    "dom7": "7",
+    "M7": "maj7",
+    "ma7": "maj7",
+    "Δ": "maj7",
+    "Δ7": "maj7",
+    "min7": "m7",
+    "-7": "m7",
+    "mM7": "mmaj7",
+    "mmaj7": "mmaj7",
+    "m(maj7)": "mmaj7",
+    "min(maj7)": "mmaj7",
+    "ø": "m7b5",
+    "ø7": "m7b5",
+    "m7(b5)": "m7b5",
+    "min7b5": "m7b5",
+    "-7b5": "m7b5",
+    "°7": "dim7",
+    "o7": "dim7",
+    "+7": "aug7",
+    "7+": "aug7",
+    "7#5": "aug7",
+    "7sus": "7sus4",
+    "add2": "add9",
+    "M9": "maj9",
+    "min9": "m9",
+    "-9": "m9"
+}
+
+
+class ChordSymbol(NamedTuple):
+    chord: Chord
+    bass: Optional[Tone] = None  # нижний тон после "/", если он указан
+
+    @property
+    def inversion(self) -> bool:
+        # Бас - нота самого аккорда (B♭maj7/D), а не посторонний тон (C/B♭)
+        return self.bass is not None and self.bass in self.chord.pitch_class_set
+
+
+def _normalize(text: str) -> str:
+    return text.replace("♯", "#").replace("♭", "b")
+
+
+def _compile() -> tuple[dict[str, Chord], dict[str, Tone]]:
+    # Ключи таблиц - в записи с #/b
+    roots = {}
+    for letter, idx in _LETTERS.items():
+        for accidental, shift in _ACCIDENTALS.items():
+            roots[_normalize(letter + accidental)] = Tone.by_idx(idx + shift)
+
+    suffixes = {_normalize(q.suffix): q.name for q in QUALITIES.values()}
+    suffixes.update({_normalize(alias): name for alias, name in SUFFIX_ALIASES.items()})
+
+    chords = {
+        root_name + suffix: Chord(root, name)
+        for root_name, root in roots.items()
+        for suffix, name in suffixes.items()
+    }
+    return chords, roots
+
+
+_CHORDS, _ROOTS = _compile()
+
+
+def _on_quality(chord_quality: ChordQuality) -> None:
+    # Новый тип дописывается в таблицу; уже известные написания (в том числе синонимы) не меняются,
+    # поэтому закэшированные результаты parse_symbol остаются верными
+    suffix = _normalize(chord_quality.suffix)
+    for root_name, root in _ROOTS.items():
+        _CHORDS.setdefault(root_name + suffix, Chord(root, chord_quality.name))
+
+
+on_quality_registered(_on_quality)
+
+_TOKENS = re.compile(r"[^\s|:]+")
+_NO_CHORD = frozenset({"N.C.", "NC", "N.C", "%"})
+
+
+@lru_cache(maxsize=65536)
+def parse_symbol(symbol: str) -> ChordSymbol:
+    normalized = _normalize(symbol.strip())
+    chord = _CHORDS.get(normalized)
+    if chord is not None:
+        return ChordSymbol(chord)
+
+    head, slash, bass = normalized.rpartition("/")
+    if not slash:
+        raise ValueError(f"unknown chord symbol {symbol!r}")
+    chord = _CHORDS.get(head)
+    if chord is None:
+        raise ValueError(f"unknown chord symbol {symbol!r}")
+    bass_tone = _ROOTS.get(bass)
+    if bass_tone is None:
+        raise ValueError(f"unknown bass note in chord symbol {symbol!r}")
+    return ChordSymbol(chord, bass_tone)
+
+
+def parse_chord(symbol: str) -> Chord:
+    return parse_symbol(symbol).chord
+
+
+def parse_symbols(symbols: Iterable[str]) -> list[ChordSymbol]:
+    parse = parse_symbol
+    return [parse(symbol) for symbol in symbols]
+
+
+def parse_lead_sheet(text: str) -> list[ChordSymbol]:
+    # Обозначения через пробелы и тактовые черты ("| Dm7 G7 | Cmaj7 |"), N.C. и % пропускаются
+    parse = parse_symbol
+    return [parse(token) for token in _TOKENS.findall(text) if token not in _NO_CHORD]
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from functools import lru_cache
+
+from src.core.chord import Chord
+from src.core.chord_index import register_chords
+from src.core.coloring import MAJOR_CIRCLE, MINOR_CIRCLE, Coloring, coloring_table
+from src.core.pitch_class_set import PitchClassSet
+
+# Сдвиг основных тонов дополнительного кольца относительно мажорного:
+# под мажорным аккордом стоит аккорд того же типа из его тональности (под C - B dim)
+RING_OFFSETS = {
+    "maj": 0,
+    "min": 9,
+    "dim": 11,
+    "m7b5": 11,
+    "7": 7,
+    "maj7": 0,
+    "m7": 9,
+    "sus4": 0,
+    "sus2": 0
+}
+
+# Типы основных колец; дополнительными они быть не могут
+BASE_RINGS = ("maj", "min")
+
+
+class CircleModel:
+
+    # Неизменяемая часть круга: строится один раз на процесс (CIRCLE_MODEL)
+    # и используется всеми сессиями только на чтение
+    __slots__ = (
+        "rings",
+        "qualities",
+        "chords",
+        "index",
+        "masks",
+        "flat_labels",
+        "sharp_labels",
+        "flat_tooltips",
+        "sharp_tooltips",
+        "coloring"
+    )
+
+    # Аккорды нумеруются по кольцам: 0..11 - мажорное, 12..23 - минорное, дальше дополнительные
+    def __init__(self, rings: tuple[tuple[Chord, ...], ...]):
+        chords = tuple(chord for ring in rings for chord in ring)
+        self.rings = rings
+        self.qualities = tuple(ring[0].quality.name for ring in rings)
+        self.chords = chords
+        self.index = {chord: idx for idx, chord in enumerate(chords)}
+        self.masks = tuple(chord.pitch_class_set.mask for chord in chords)
+        self.flat_labels = tuple(c.flat_name for c in chords)
+        self.sharp_labels = tuple(c.sharp_name for c in chords)
+        self.flat_tooltips = tuple(" ".join(t.flat_name for t in c.tones()) for c in chords)
+        self.sharp_tooltips = tuple(" ".join(t.sharp_name for t in c.tones()) for c in chords)
+        self.coloring: dict[tuple[Coloring, Chord], tuple[str, ...]] = coloring_table(rings)
+
+    def __setattr__(self, key, value):
+        if hasattr(self, key):
+            raise AttributeError(f"CircleModel.{key} is read-only")
+        super(CircleModel, self).__setattr__(key, value)
+
+
+CIRCLE_MODEL = CircleModel((MAJOR_CIRCLE, MINOR_CIRCLE))
+
+
+@lru_cache(maxsize=None)
+def circle_model(extra_rings: tuple[str, ...] = ()) -> CircleModel:
+    # Модель с дополнительными кольцами внутри минорного, одна на процесс для каждого набора
+    if not extra_rings:
+        return CIRCLE_MODEL
+    # Повтор кольца дал бы два одинаковых аккорда на круге и испортил бы model.index
+    if len(set(extra_rings)) != len(extra_rings) or set(extra_rings) & set(BASE_RINGS):
+        raise ValueError(f"extra rings must be distinct and not {BASE_RINGS}: {extra_rings!r}")
+    rings = [MAJOR_CIRCLE, MINOR_CIRCLE]
+    for name in extra_rings:
+        rings.append(tuple(Chord.ring(name, RING_OFFSETS.get(name, 0))))
+        register_chords(rings[-1])
+    return CircleModel(tuple(rings))
+
+
+EMPTY_SELECTION = PitchClassSet()
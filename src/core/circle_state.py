@@ -0,0 +1,207 @@
+from __future__ import annotations
+from enum import Enum, auto
+from functools import lru_cache
+from typing import Optional
+
+from src.core import colors, orientation
+from src.core.chord import Chord, MajorTriad, MinorTriad
+from src.core.chord_index import CHORD_INDEX
+from src.core.circle_model import CIRCLE_MODEL, EMPTY_SELECTION, CircleModel
+from src.core.coloring import Coloring
+from src.core.pitch_class_set import PitchClassSet
+from src.core.scale_index import tonic_chords
+from src.core.tonnetz import tonnetz
+
+
+class Mode(Enum):
+    AXIS = auto()  # Функциональные оси
+    COMMON = auto()  # Общие ноты
+    NEGATIVE = auto()  # Негативная гармония
+    PATH = auto()  # Кратчайшая цепочка преобразований P/L/R между двумя аккордами
+
+
+class Spelling(Enum):
+    FLATS = auto()  # Бемоли
+    SHARPS = auto()  # Диезы
+
+
+AXIS_COLORS = (
+    colors.BLUE_GREY_900,
+    colors.BLUE_GREY_700,
+    colors.GREY_600
+)
+GREY_COLOR = colors.BLUE_GREY_200
+
+# Режим PATH: начало цепочки, промежуточные аккорды, конец
+PATH_COLORS = (
+    colors.BLACK,
+    colors.RED_400,
+    colors.RED_800
+)
+
+_COLORINGS = {
+    Mode.COMMON: Coloring.COMMON,
+    Mode.NEGATIVE: Coloring.NEGATIVE
+}
+
+
+@lru_cache(maxsize=None)
+def _axis_colors(offset: int, rings: int) -> tuple[str, ...]:
+    # Раскраска функциональных осей для поворота круга, одинаковая на всех кольцах
+    return tuple(AXIS_COLORS[orientation.slot(offset, idx) % 3] for idx in range(12)) * rings
+
+
+@lru_cache(maxsize=None)
+def _grey_colors(n: int) -> tuple[str, ...]:
+    return (GREY_COLOR,) * n
+
+
+@lru_cache(maxsize=4096)
+def _path_colors(model: CircleModel, start: Chord, end: Optional[Chord]) -> tuple[str, ...]:
+    result = list(_grey_colors(len(model.chords)))
+    graph = tonnetz()
+    path = None
+    if end is not None and start in graph.index and end in graph.index:
+        path = graph.path(start, end)
+    for chord in path or ():
+        result[model.index[chord]] = PATH_COLORS[1]
+    if end is not None:
+        result[model.index[end]] = PATH_COLORS[2]
+    result[model.index[start]] = PATH_COLORS[0]
+    return tuple(result)
+
+
+@lru_cache(maxsize=4096)
+def _highlight_flags(model: CircleModel, selection: PitchClassSet) -> tuple[bool, ...]:
+    # Аккорды круга, содержащие все выбранные ноты; индекс знает весь словарь, на круге - только часть
+    flags = [False] * len(model.chords)
+    if selection:
+        index = model.index
+        for chord in CHORD_INDEX.containing(selection):
+            idx = index.get(chord)
+            if idx is not None:
+                flags[idx] = True
+    return tuple(flags)
+
+
+@lru_cache(maxsize=4096)
+def _tonic_flags(model: CircleModel, selection: PitchClassSet) -> tuple[bool, ...]:
+    # Аккорды круга, стоящие на тониках ладов, в которые входят все выбранные ноты
+    flags = [False] * len(model.chords)
+    if selection:
+        for chord in tonic_chords(selection, model.index):
+            flags[model.index[chord]] = True
+    return tuple(flags)
+
+
+class CircleState:
+
+    # Изменяемое состояние одной сессии; все таблицы берутся из общей модели (CIRCLE_MODEL).
+    # Аккорды нумеруются в порядке model.chords: 0..11 - мажорное кольцо, 12..23 - минорное,
+    # дальше дополнительные кольца
+    __slots__ = ("_model", "_mode", "_spelling", "_selection", "_offset", "_major_tonic", "_main", "_target")
+
+    def __init__(self, model: CircleModel = CIRCLE_MODEL):
+        self._model = model
+        self._mode = Mode.AXIS
+        self._spelling = Spelling.FLATS
+        self._selection = EMPTY_SELECTION
+        self._offset = 0
+        self._major_tonic = True
+        self._main: Optional[Chord] = None
+        self._target: Optional[Chord] = None  # конец цепочки в режиме PATH
+
+    @property
+    def model(self) -> CircleModel:
+        return self._model
+
+    @property
+    def mode(self) -> Mode:
+        return self._mode
+
+    @property
+    def spelling(self) -> Spelling:
+        return self._spelling
+
+    @property
+    def selection(self) -> PitchClassSet:
+        return self._selection
+
+    @property
+    def offset(self) -> int:
+        return self._offset
+
+    @property
+    def main(self) -> Optional[Chord]:
+        return self._main
+
+    @property
+    def target(self) -> Optional[Chord]:
+        return self._target
+
+    def index_of(self, chord: Chord) -> int:
+        return self._model.index[chord]
+
+    def set_mode(self, mode: Mode) -> None:
+        self._mode = mode
+        self._main = None
+        self._target = None
+
+    def set_spelling(self, spelling: Spelling) -> None:
+        self._spelling = spelling
+
+    def select(self, tones: PitchClassSet) -> None:
+        self._selection = tones
+
+    def click(self, idx: int) -> None:
+        chord = self._model.chords[idx]
+        if self._mode == Mode.AXIS:
+            self._offset = idx % 12
+        if self._mode == Mode.PATH and self._main is not None and self._target is None:
+            # Второй клик задает конец цепочки, третий начинает новую
+            self._target = chord
+            return
+        self._main = chord
+        self._target = None
+        # Лад меняют только трезвучия основных колец; аккорд дополнительного кольца
+        # стоит в столбце своей тоники (B° под C) и сохраняет текущий лад
+        if isinstance(chord, (MajorTriad, MinorTriad)):
+            self._major_tonic = isinstance(chord, MajorTriad)
+
+    def slot(self, idx: int) -> int:
+        return orientation.slot(self._offset, idx % 12)
+
+    def degree(self, idx: int) -> Optional[str]:
+        return orientation.degree(self._offset, idx % 12, self._model.qualities[idx // 12], self._major_tonic)
+
+    def colors(self) -> tuple[str, ...]:
+        if self._mode == Mode.AXIS:
+            return _axis_colors(self._offset, len(self._model.rings))
+        if self._main is None:
+            return _grey_colors(len(self._model.chords))
+        if self._mode == Mode.PATH:
+            return _path_colors(self._model, self._main, self._target)
+        return self._model.coloring[(_COLORINGS[self._mode], self._main)]
+
+    def path(self) -> Optional[list[Chord]]:
+        # Цепочка P/L/R от главного аккорда до конечного (режим PATH)
+        graph = tonnetz()
+        if self._target is None or self._main not in graph.index or self._target not in graph.index:
+            return None
+        return graph.path(self._main, self._target)
+
+    def labels(self) -> tuple[str, ...]:
+        if self._spelling == Spelling.SHARPS:
+            return self._model.sharp_labels
+        return self._model.flat_labels
+
+    def tooltips(self) -> tuple[str, ...]:
+        if self._spelling == Spelling.SHARPS:
+            return self._model.sharp_tooltips
+        return self._model.flat_tooltips
+
+    def highlighted(self) -> tuple[bool, ...]:
+        return _highlight_flags(self._model, self._selection)
+
+    def tonics(self) -> tuple[bool, ...]:
+        return _tonic_flags(self._model, self._selection)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+from enum import Enum, auto
+
+from src.core import colors
+from src.core.chord import Chord, MajorTriad, MinorTriad
+from src.core.negative_harmony import negative_mask
+
+
+class Coloring(Enum):
+    COMMON = auto()  # Общие ноты
+    NEGATIVE = auto()  # Негативная гармония
+
+
+MAJOR_CIRCLE: tuple[MajorTriad, ...] = tuple(MajorTriad.circle())
+MINOR_CIRCLE: tuple[MinorTriad, ...] = tuple(MinorTriad.circle())
+
+# Порядок цветов в таблицах: внешнее кольцо, затем внутреннее
+CIRCLE: tuple[Chord, ...] = MAJOR_CIRCLE + MINOR_CIRCLE
+
+# Количество общих нот с главным аккордом -> цвет
+COMMON_TONE_COLORS = {
+    3: colors.BLACK,
+    2: colors.RED_600,
+    1: colors.RED_300,
+    0: colors.BLUE_GREY_200
+}
+
+# Цвета пар "аккорд - его негатив" по расстоянию в квинтах от главного аккорда
+NEGATIVE_PALETTE = (
+    colors.BLACK,
+    colors.BLUE_800,
+    colors.BLUE_400,
+    colors.GREY_700,
+    colors.GREEN_400,
+    colors.RED_400,
+    colors.PURPLE_400,
+    colors.ORANGE_400,
+    colors.ORANGE_800,
+    colors.PURPLE_800,
+    colors.RED_800,
+    colors.GREEN_800
+)
+
+
+def _common_colors(main: Chord, chords: tuple[Chord, ...]) -> tuple[str, ...]:
+    # Пересечение масок: таблица строится при импорте, матрицы src.core.voice_leading здесь не нужны
+    main_tones = main.pitch_class_set
+    return tuple(
+        COMMON_TONE_COLORS[min(len(main_tones & chord.pitch_class_set), 3)]
+        for chord in chords
+    )
+
+
+def _negative_colors(main: Chord, rings: tuple[tuple[Chord, ...], ...]) -> tuple[str, ...]:
+    # Пары "аккорд - негатив" считает src.core.negative_harmony (ось тоники главного аккорда)
+    by_mask = {chord.pitch_class_set.mask: chord for ring in rings for chord in ring}
+
+    # Для минорной тоники палитра обходит круг в обратную сторону
+    main_ring = next(ring for ring in rings if main in ring)
+    direction = 1 if isinstance(main, MajorTriad) else -1
+    start = main_ring.index(main)
+
+    # Сначала кольцо главного аккорда (вместе с негативами - соседнее кольцо),
+    # затем оставшиеся аккорды остальных колец, по позициям от той же начальной
+    result = {}
+    for ring in (main_ring, *rings):
+        for distance in range(12):
+            chord = ring[(start + distance) % 12]
+            if chord in result:
+                continue
+            color = NEGATIVE_PALETTE[direction * distance % 12]
+            result[chord] = color
+            negative = by_mask.get(negative_mask(chord.pitch_class_set.mask, main.root))
+            if negative is not None and negative not in result:
+                result[negative] = color
+    return tuple(result[chord] for ring in rings for chord in ring)
+
+
+def coloring_table(rings: tuple[tuple[Chord, ...], ...]) -> dict[tuple[Coloring, Chord], tuple[str, ...]]:
+    # Цвета всех аккордов колец (в порядке колец) для каждого режима и главного аккорда
+    chords = tuple(chord for ring in rings for chord in ring)
+    return {
+        **{(Coloring.COMMON, main): _common_colors(main, chords) for main in chords},
+        **{(Coloring.NEGATIVE, main): _negative_colors(main, rings) for main in chords}
+    }
+
+
+COLORING_TABLE = coloring_table((MAJOR_CIRCLE, MINOR_CIRCLE))
@@ -0,0 +1,27 @@
+# Имена цветов совпадают с flet.colors, чтобы ядро не зависело от Flet
+BLACK = "black"
+
+BLUE_GREY_100 = "bluegrey100"
+BLUE_GREY_200 = "bluegrey200"
+BLUE_GREY_700 = "bluegrey700"
+BLUE_GREY_900 = "bluegrey900"
+
+GREY_600 = "grey600"
+GREY_700 = "grey700"
+
+RED_300 = "red300"
+RED_400 = "red400"
+RED_600 = "red600"
+RED_800 = "red800"
+
+BLUE_400 = "blue400"
+BLUE_800 = "blue800"
+
+GREEN_400 = "green400"
+GREEN_800 = "green800"
+
+PURPLE_400 = "purple400"
+PURPLE_800 = "purple800"
+
+ORANGE_400 = "orange400"
+ORANGE_800 = "orange800"
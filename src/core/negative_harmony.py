@@ -0,0 +1,99 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Iterable, Optional, Union
+
+from src.core.chord import Chord, ChordQuality, on_quality_registered
+from src.core.pitch_class_set import FULL_MASK, PitchClassSet
+from src.core.tone import Tone
+from src.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Негативная гармония: отражение высотных классов относительно оси тоники,
+# которая проходит посередине между тоникой и доминантой: x -> 2 * tonic + 7 - x (mod 12).
+# При тонике C: C <-> G, E <-> E♭, поэтому C -> Cm, G7 -> Dm7♭5.
+# Скалярные функции работают без NumPy, векторные принимают массивы
+# высотных классов (0..11) или масок (0..4095) и тоник любой совместимой формы
+
+TonicLike = Union[Tone, int]
+
+
+def _idx(tonic: TonicLike) -> int:
+    return tonic.idx if isinstance(tonic, Tone) else tonic
+
+
+def axis(tonic: TonicLike) -> int:
+    return (2 * _idx(tonic) + 7) % 12
+
+
+def negative_mask(mask: int, tonic: TonicLike) -> int:
+    return PitchClassSet(mask).invert(axis(tonic)).mask
+
+
+def negative_pitch_class_set(pcs: PitchClassSet, tonic: TonicLike) -> PitchClassSet:
+    return pcs.invert(axis(tonic))
+
+
+@lru_cache(maxsize=None)
+def _chords_by_mask() -> dict[int, tuple[Chord, ...]]:
+    by_mask: dict[int, tuple[Chord, ...]] = {}
+    for chord in Chord.vocabulary():
+        mask = chord.pitch_class_set.mask
+        by_mask[mask] = by_mask.get(mask, ()) + (chord,)
+    return by_mask
+
+
+@lru_cache(maxsize=None)
+def _negative_chord(chord: Chord, tonic_idx: int) -> Optional[Chord]:
+    a = axis(tonic_idx)
+    candidates = _chords_by_mask().get(chord.pitch_class_set.invert(a).mask, ())
+    # Отражение переворачивает аккорд: основным тоном становится отражение верхнего звука
+    # (квинта C -> C в Cm), а при неоднозначной маске (C6 / Am7) - тип, раньше стоящий в таблице
+    root = Tone.by_idx(a - chord.tones()[-1].idx)
+    for candidate in candidates:
+        if candidate.root == root:
+            return candidate
+    return candidates[0] if candidates else None
+
+
+
+def _on_quality(chord_quality: ChordQuality) -> None:
+    # Отражение, раньше не имевшее названия (None), может оказаться аккордом нового типа
+    _chords_by_mask.cache_clear()
+    _negative_chord.cache_clear()
+
+
+on_quality_registered(_on_quality)
+
+
+def negative_chord(chord: Chord, tonic: TonicLike) -> Optional[Chord]:
+    # None, если у отражения нет названия в словаре типов аккордов
+    return _negative_chord(chord, _idx(tonic) % 12)
+
+
+def negative_progression(chords: Iterable[Chord], tonic: TonicLike) -> list[Optional[Chord]]:
+    tonic_idx = _idx(tonic) % 12
+    negative = _negative_chord
+    return [negative(chord, tonic_idx) for chord in chords]
+
+
+@lru_cache(maxsize=None)
+def reflection_table() -> np.ndarray:
+    # (ось, маска) -> отраженная маска: бит i переходит в бит (ось - i) mod 12
+    masks = np.arange(FULL_MASK + 1, dtype=np.uint16)
+    table = np.zeros((12, FULL_MASK + 1), dtype=np.uint16)
+    for a in range(12):
+        for i in range(12):
+            table[a] |= ((masks >> i) & 1) << ((a - i) % 12)
+    table.flags.writeable = False
+    return table
+
+
+def negative_masks(masks, tonics) -> np.ndarray:
+    # Маски и тоники (высотные классы) транслируются друг на друга по правилам NumPy
+    axes = (2 * np.asarray(tonics) + 7) % 12
+    return reflection_table()[axes, np.asarray(masks) & FULL_MASK]
+
+
+def negative_pitch_classes(pitch_classes, tonics) -> np.ndarray:
+    return (2 * np.asarray(tonics) + 7 - np.asarray(pitch_classes)) % 12
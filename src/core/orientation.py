@@ -0,0 +1,29 @@
+from typing import Optional
+
+
+# Поворот круга задается одним числом offset: индексом (в порядке Chord.circle())
+# аккорда наверху. Все кольца поворачиваются вместе
+
+# Ступени по позиции на круге (0 - верх, 1 - против часовой, 11 - по часовой)
+# (мажорная тоника?, тип аккордов кольца) -> {позиция: ступень}
+DEGREES: dict[tuple[bool, str], dict[int, str]] = {
+    (True, "maj"): {0: "I", 1: "IV", 11: "V"},
+    (True, "min"): {0: "vi", 1: "ii", 11: "iii"},
+    (True, "dim"): {0: "vii°"},
+    (True, "m7b5"): {0: "viiø"},
+    (True, "7"): {0: "V7"},
+    (False, "maj"): {0: "III", 1: "VI", 11: "VII"},
+    (False, "min"): {0: "i", 1: "iv", 11: "v"},
+    (False, "dim"): {0: "ii°"},
+    (False, "m7b5"): {0: "iiø"}
+}
+
+_NO_DEGREES: dict[int, str] = {}
+
+
+def slot(offset: int, idx: int) -> int:
+    return (idx - offset) % 12
+
+
+def degree(offset: int, idx: int, ring_quality: str, major_tonic: bool) -> Optional[str]:
+    return DEGREES.get((major_tonic, ring_quality), _NO_DEGREES).get(slot(offset, idx))
@@ -0,0 +1,90 @@
+from __future__ import annotations
+from typing import Iterable, Iterator
+
+from src.core.tone import Tone
+
+
+FULL_MASK = 0xFFF
+
+
+class PitchClassSet:
+
+    # Множество высотных классов в виде 12-битной маски: бит i <=> Tone.by_idx(i)
+    __slots__ = ("_mask",)
+
+    def __init__(self, mask: int = 0):
+        self._mask = mask & FULL_MASK
+
+    @classmethod
+    def of(cls, tones: Iterable[Tone]) -> PitchClassSet:
+        mask = 0
+        for tone in tones:
+            mask |= 1 << tone.idx
+        return cls(mask)
+
+    @property
+    def mask(self) -> int:
+        return self._mask
+
+    def tones(self) -> list[Tone]:
+        return [Tone.by_idx(i) for i in range(12) if self._mask >> i & 1]
+
+    def issubset(self, other: PitchClassSet) -> bool:
+        return self._mask & other._mask == self._mask
+
+    def issuperset(self, other: PitchClassSet) -> bool:
+        return self._mask & other._mask == other._mask
+
+    def transpose(self, n: int) -> PitchClassSet:
+        n %= 12
+        mask = self._mask
+        return PitchClassSet((mask << n | mask >> (12 - n)) & FULL_MASK)
+
+    def invert(self, axis: int = 0) -> PitchClassSet:
+        # i -> (axis - i) mod 12
+        return PitchClassSet(_REVERSED[self._mask]).transpose(axis + 1)
+
+    def __len__(self) -> int:
+        return self._mask.bit_count()
+
+    def __bool__(self) -> bool:
+        return self._mask != 0
+
+    def __iter__(self) -> Iterator[Tone]:
+        return iter(self.tones())
+
+    def __contains__(self, tone: Tone) -> bool:
+        return bool(self._mask >> tone.idx & 1)
+
+    def __and__(self, other: PitchClassSet) -> PitchClassSet:
+        return PitchClassSet(self._mask & other._mask)
+
+    def __or__(self, other: PitchClassSet) -> PitchClassSet:
+        return PitchClassSet(self._mask | other._mask)
+
+    def __sub__(self, other: PitchClassSet) -> PitchClassSet:
+        return PitchClassSet(self._mask & ~other._mask)
+
+    def __le__(self, other: PitchClassSet) -> bool:
+        return self.issubset(other)
+
+    def __ge__(self, other: PitchClassSet) -> bool:
+        return self.issuperset(other)
+
+    def __eq__(self, other):
+        if not isinstance(other, PitchClassSet):
+            return NotImplemented
+        return self._mask == other._mask
+
+    def __hash__(self):
+        return self._mask
+
+    def __repr__(self):
+        return f"PitchClassSet({' '.join(t.sharp_name for t in self.tones())})"
+
+
+# Зеркальное отражение 12 бит: бит i -> бит 11 - i
+_REVERSED = tuple(
+    int(format(mask, "012b")[::-1], 2)
+    for mask in range(FULL_MASK + 1)
+)
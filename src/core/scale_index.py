@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import Iterable, Optional
+
+from src.core.chord import Chord
+from src.core.pitch_class_set import FULL_MASK, PitchClassSet
+from src.core.tone import Tone
+from src.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Имя, интервалы от тоники
+SCALE_TABLE: tuple[tuple[str, tuple[int, ...]], ...] = (
+    ("ionian", (0, 2, 4, 5, 7, 9, 11)),
+    ("dorian", (0, 2, 3, 5, 7, 9, 10)),
+    ("phrygian", (0, 1, 3, 5, 7, 8, 10)),
+    ("lydian", (0, 2, 4, 6, 7, 9, 11)),
+    ("mixolydian", (0, 2, 4, 5, 7, 9, 10)),
+    ("aeolian", (0, 2, 3, 5, 7, 8, 10)),
+    ("locrian", (0, 1, 3, 5, 6, 8, 10)),
+    ("harmonic minor", (0, 2, 3, 5, 7, 8, 11)),
+    ("melodic minor", (0, 2, 3, 5, 7, 9, 11))
+)
+
+# Тип трезвучия на тонике по терции и квинте
+_TONIC_TRIADS = {(4, 7): "maj", (3, 7): "min", (3, 6): "dim", (4, 8): "aug"}
+
+
+class Scale:
+
+    # Лад от конкретной тоники; создается один раз на пару (тоника, лад)
+    __slots__ = ("root", "kind", "pitch_class_set", "tonic_chord")
+
+    _instances: dict[tuple[Tone, str], Scale] = {}
+
+    def __new__(cls, root: Tone, kind: str):
+        scale = Scale._instances.get((root, kind))
+        if scale is None:
+            intervals = dict(SCALE_TABLE).get(kind)
+            if intervals is None:
+                raise ValueError(f"unknown scale {kind!r}")
+            scale = super(Scale, cls).__new__(cls)
+            scale.root = root
+            scale.kind = kind
+            scale.pitch_class_set = PitchClassSet.of(Tone.by_idx(root.idx + i) for i in intervals)
+            third = 3 if 3 in intervals else 4
+            fifth = next(i for i in (7, 6, 8) if i in intervals)
+            scale.tonic_chord = Chord(root, _TONIC_TRIADS[(third, fifth)])
+            Scale._instances[(root, kind)] = scale
+        return scale
+
+    def __reduce__(self):
+        return Scale, (self.root, self.kind)
+
+    def __repr__(self):
+        return f"Scale({self.name})"
+
+    @property
+    def name(self) -> str:
+        return f"{self.root.sharp_name} {self.kind}"
+
+    @staticmethod
+    def all() -> list[Scale]:
+        # Порядок: по ладам из SCALE_TABLE, внутри лада - по тонике от C
+        return [Scale(root, kind) for kind, _ in SCALE_TABLE for root in Tone.twelve_tone_row()]
+
+
+class ScaleIndex:
+
+    # Как ChordIndex: для каждой из 4096 масок - лады, содержащие все ее ноты
+    def __init__(self, scales: Iterable[Scale]):
+        self.scales = tuple(scales)
+        self.masks = tuple(scale.pitch_class_set.mask for scale in self.scales)
+        self._by_subset: list[tuple[Scale, ...]] = [() for _ in range(FULL_MASK + 1)]
+        self._tables_cache: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        for scale in self.scales:
+            mask = scale.pitch_class_set.mask
+            subset = mask
+            while True:
+                self._by_subset[subset] += (scale,)
+                if subset == 0:
+                    break
+                subset = (subset - 1) & mask
+
+    def __len__(self) -> int:
+        return len(self.scales)
+
+    def containing(self, tones: PitchClassSet) -> tuple[Scale, ...]:
+        return self._by_subset[tones.mask]
+
+    def _tables(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # Для каждой из 4096 масок: какие лады ее содержат, сколько их и первый из них (-1 - ни одного).
+        # Строятся при первом векторном запросе, дальше любой запрос - одна выборка по массиву масок
+        if self._tables_cache is None:
+            masks = np.arange(FULL_MASK + 1)[:, np.newaxis]
+            table = masks & np.array(self.masks)[np.newaxis, :] == masks
+            counts = table.sum(axis=1, dtype=np.int16)
+            first = np.where(counts > 0, table.argmax(axis=1), -1).astype(np.int16)
+            for array in (table, counts, first):
+                array.flags.writeable = False
+            self._tables_cache = (table, counts, first)
+        return self._tables_cache
+
+    def matches(self, masks) -> np.ndarray:
+        # Массив масок формы (...) -> булев массив (..., лад) в порядке self.scales
+        return self._tables()[0][np.asarray(masks) & FULL_MASK]
+
+    def match_counts(self, masks) -> np.ndarray:
+        return self._tables()[1][np.asarray(masks) & FULL_MASK]
+
+    def classify(self, masks) -> np.ndarray:
+        # Номер первого подходящего лада в порядке self.scales или -1
+        return self._tables()[2][np.asarray(masks) & FULL_MASK]
+
+
+SCALE_INDEX = ScaleIndex(Scale.all())
+
+
+def tonic_chords(tones: PitchClassSet, chords: Optional[Iterable[Chord]] = None) -> set[Chord]:
+    # Трезвучия на тониках всех ладов, содержащих tones (C для C ionian, Dm для D dorian)
+    result = {scale.tonic_chord for scale in SCALE_INDEX.containing(tones)}
+    if chords is not None:
+        result.intersection_update(chords)
+    return result
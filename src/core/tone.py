@@ -8,27 +8,44 @@ TTR_FLAT = ["C", "D♭", "D", "E♭", "E", "F", "G♭", "G", "A♭", "A", "B♭"
 
 class Tone:
 
-    def __init__(self, idx: int):
-        self._idx = idx % 12
+    # Все 12 тонов создаются один раз при импорте модуля,
+    # Tone(idx) / Tone.by_idx(idx) / Tone.by_name(name) возвращают их же
+    __slots__ = ("_idx",)
+
+    _instances: tuple[Tone, ...] = ()
+    _by_name: dict[str, Tone] = {}
+
+    def __new__(cls, idx: int) -> Tone:
+        return cls._instances[idx % 12]
 
     def __eq__(self, other):
-        return self._idx == other.idx
+        if not isinstance(other, Tone):
+            return NotImplemented
+        return self._idx == other._idx
+
+    def __hash__(self):
+        return self._idx
+
+    def __repr__(self):
+        return f"Tone({self.sharp_name})"
+
+    def __reduce__(self):
+        return Tone, (self._idx,)
 
     @classmethod
     def by_idx(cls, idx: int) -> Tone:
-        return cls(idx)
+        return cls._instances[idx % 12]
 
     @classmethod
     def by_name(cls, name: str) -> Tone:
-        if name in TTR_SHARP:
-            return cls(TTR_SHARP.index(name))
-        if name in TTR_FLAT:
-            return cls(TTR_SHARP.index(name))
-        raise ValueError
+        try:
+            return cls._by_name[name]
+        except KeyError:
+            raise ValueError(name) from None
 
     @classmethod
     def twelve_tone_row(cls) -> list[Tone]:
-        return [cls.by_idx(i) for i in range(12)]
+        return list(cls._instances)
 
     @property
     def idx(self) -> int:
@@ -41,3 +58,22 @@ class Tone:
     @property
     def flat_name(self) -> str:
         return TTR_FLAT[self._idx]
+
+
+def _intern_tones() -> None:
+    instances = []
+    for idx in range(12):
+        tone = object.__new__(Tone)
+        tone._idx = idx
+        instances.append(tone)
+    Tone._instances = tuple(instances)
+
+    by_name = {}
+    for tone in instances:
+        for name in (tone.sharp_name, tone.flat_name):
+            by_name[name] = tone
+            by_name[name.replace("♯", "#").replace("♭", "b")] = tone
+    Tone._by_name = by_name
+
+
+_intern_tones()
@@ -0,0 +1,144 @@
+from __future__ import annotations
+from collections import deque
+from functools import lru_cache
+from typing import Callable, Iterable, Optional
+
+from src.core.chord import Chord, MajorTriad, MinorTriad
+from src.core.tone import Tone
+
+# Неоримановы преобразования трезвучий (тоннетц):
+# P - одноименное (C <-> Cm), R - параллельное (C <-> Am), L - вводнотоновое (C <-> Em).
+# Граф строится один раз, кратчайшие цепочки между всеми парами аккордов считаются
+# сразу, так что "C -> G♯m" - это поиск в таблице, а не обход графа
+
+
+def _parallel(chord: Chord) -> Chord:
+    if isinstance(chord, MajorTriad):
+        return MinorTriad(chord.root)
+    return MajorTriad(chord.root)
+
+
+def _relative(chord: Chord) -> Chord:
+    if isinstance(chord, MajorTriad):
+        return MinorTriad(Tone.by_idx(chord.root.idx + 9))
+    return MajorTriad(Tone.by_idx(chord.root.idx + 3))
+
+
+def _leading_tone(chord: Chord) -> Chord:
+    if isinstance(chord, MajorTriad):
+        return MinorTriad(Tone.by_idx(chord.root.idx + 4))
+    return MajorTriad(Tone.by_idx(chord.root.idx + 8))
+
+
+# Порядок важен: при равной длине цепочки предпочитается преобразование, стоящее раньше
+TRANSFORMS: dict[str, Callable[[Chord], Chord]] = {
+    "P": _parallel,
+    "L": _leading_tone,
+    "R": _relative
+}
+
+# Септаккорды, добавляемые в граф по tonnetz(sevenths=True)
+SEVENTHS = ("7", "m7", "maj7", "m7b5")
+
+# Ребро между аккордами, отличающимися сдвигом одного голоса на полутон
+# (с удвоением, если размеры разные: C -> Cmaj7); используется для септаккордов
+SEMITONE = "S"
+
+
+class TonnetzGraph:
+
+    # Вершины - аккорды, ребра помечены преобразованием. Для каждой пары (i, j)
+    # хранится первый шаг кратчайшего пути и длина, цепочка восстанавливается по таблице
+    __slots__ = ("chords", "index", "neighbors", "_next", "_distance", "_chains")
+
+    def __init__(self, chords: tuple[Chord, ...], edges: Iterable[tuple[Chord, str, Chord]]):
+        self.chords = chords
+        self.index = {chord: idx for idx, chord in enumerate(chords)}
+        neighbors: list[list[tuple[str, int]]] = [[] for _ in chords]
+        for a, label, b in edges:
+            i, j = self.index[a], self.index[b]
+            if all(k != j for _, k in neighbors[i]):
+                neighbors[i].append((label, j))
+        self.neighbors = tuple(tuple(n) for n in neighbors)
+
+        n = len(chords)
+        self._next = [[-1] * n for _ in range(n)]
+        self._distance = [[-1] * n for _ in range(n)]
+        for source in range(n):
+            self._bfs(source)
+        self._chains = [[self._build_chain(i, j) for j in range(n)] for i in range(n)]
+
+    def _bfs(self, source: int) -> None:
+        # Обход от source; первый шаг к каждой вершине наследуется от предшественника
+        distance = self._distance[source]
+        first = self._next[source]
+        distance[source] = 0
+        first[source] = source
+        queue = deque([source])
+        while queue:
+            v = queue.popleft()
+            for _, u in self.neighbors[v]:
+                if distance[u] < 0:
+                    distance[u] = distance[v] + 1
+                    first[u] = u if v == source else first[v]
+                    queue.append(u)
+
+    def _label(self, i: int, j: int) -> str:
+        for label, k in self.neighbors[i]:
+            if k == j:
+                return label
+        raise KeyError((i, j))
+
+    def _build_chain(self, i: int, j: int) -> Optional[str]:
+        if self._distance[i][j] < 0:
+            return None
+        labels = []
+        while i != j:
+            step = self._next[i][j]
+            labels.append(self._label(i, step))
+            i = step
+        return "".join(labels)
+
+    def distance(self, a: Chord, b: Chord) -> Optional[int]:
+        d = self._distance[self.index[a]][self.index[b]]
+        return d if d >= 0 else None
+
+    def chain(self, a: Chord, b: Chord) -> Optional[str]:
+        # Преобразования по порядку применения: chain(C, G♯m) == "PLP" (C -> Cm -> G♯ -> G♯m)
+        return self._chains[self.index[a]][self.index[b]]
+
+    def path(self, a: Chord, b: Chord) -> Optional[list[Chord]]:
+        i, j = self.index[a], self.index[b]
+        if self._distance[i][j] < 0:
+            return None
+        path = [self.chords[i]]
+        while i != j:
+            i = self._next[i][j]
+            path.append(self.chords[i])
+        return path
+
+    def annotate(self, progression: Iterable[Chord]) -> list[Optional[str]]:
+        # Цепочки между соседними аккордами; None, если аккорда нет в графе или пути нет
+        chains = self._chains
+        indices = [self.index.get(chord) for chord in progression]
+        return [
+            chains[i][j] if i is not None and j is not None else None
+            for i, j in zip(indices, indices[1:])
+        ]
+
+
+@lru_cache(maxsize=None)
+def tonnetz(sevenths: bool = False) -> TonnetzGraph:
+    triads = tuple(MajorTriad.circle() + MinorTriad.circle())
+    edges = [(chord, label, transform(chord)) for chord in triads for label, transform in TRANSFORMS.items()]
+    if not sevenths:
+        return TonnetzGraph(triads, edges)
+
+    from src.core.voice_leading import voice_leading
+    chords = triads + tuple(Chord.vocabulary(SEVENTHS))
+    matrix = voice_leading()
+    for a in chords:
+        for b in chords:
+            if a is not b and matrix.voice_leading(a, b) == 1:
+                edges.append((a, SEMITONE, b))
+    return TonnetzGraph(chords, edges)
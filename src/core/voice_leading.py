@@ -0,0 +1,164 @@
+from __future__ import annotations
+import hashlib
+import itertools
+import os
+import tempfile
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from src.core.chord import Chord, ChordQuality, on_quality_registered
+from src.core.pitch_class_set import FULL_MASK
+from src.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+# Матрицы "аккорд x аккорд" для всего словаря (Chord.vocabulary()):
+# количество общих нот и минимальное голосоведение - сумма сдвигов голосов в полутонах
+# по кратчайшему пути, где каждая нота одного аккорда переходит в ноту другого и
+# каждая нота другого достигается (у аккордов разного размера ноты удваиваются).
+# Матрицы кэшируются на диске по хэшу словаря
+
+CACHE_DIR = os.environ.get(
+    "CIRCLE_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "circle-of-fifths")
+)
+
+
+class VoiceLeading:
+
+    __slots__ = ("chords", "index", "common", "distance")
+
+    def __init__(self, chords: tuple[Chord, ...], common: np.ndarray, distance: np.ndarray):
+        self.chords = chords
+        self.index = {chord: idx for idx, chord in enumerate(chords)}
+        self.common = common
+        self.distance = distance
+
+    def common_tones(self, a: Chord, b: Chord) -> int:
+        i, j = self.index.get(a), self.index.get(b)
+        if i is None or j is None:
+            return len(a.pitch_class_set & b.pitch_class_set)
+        return int(self.common[i, j])
+
+    def voice_leading(self, a: Chord, b: Chord) -> int:
+        return int(self.distance[self.index[a], self.index[b]])
+
+    def nearest(
+            self,
+            chord: Chord,
+            k: int = 5,
+            among: Optional[Iterable[Chord]] = None
+    ) -> list[tuple[Chord, int]]:
+        # k самых плавных переходов из chord: по голосоведению, при равенстве - больше общих нот
+        i = self.index[chord]
+        if among is None:
+            candidates = np.arange(len(self.chords))
+        else:
+            candidates = np.fromiter((self.index[c] for c in among), dtype=np.intp)
+        candidates = candidates[candidates != i]
+        distance = self.distance[i, candidates]
+        common = self.common[i, candidates]
+        order = np.lexsort((-common.astype(np.int16), distance))[:k]
+        return [(self.chords[j], int(distance[o])) for o, j in zip(order, candidates[order])]
+
+
+def vocabulary_hash(chords: Iterable[Chord]) -> str:
+    h = hashlib.sha1()
+    for chord in chords:
+        h.update(f"{chord.quality.name}:{chord.quality.intervals}:{chord.root.idx};".encode())
+    return h.hexdigest()[:16]
+
+
+def common_tone_matrix(masks: np.ndarray) -> np.ndarray:
+    popcount = np.array([bin(m).count("1") for m in range(FULL_MASK + 1)], dtype=np.uint8)
+    return popcount[masks[:, np.newaxis] & masks[np.newaxis, :]]
+
+
+@lru_cache(maxsize=None)
+def _surjections(n: int, m: int) -> np.ndarray:
+    # Все отображения n голосов на m нот, задевающие каждую ноту: массив (вариант, голос)
+    maps = [p for p in itertools.product(range(m), repeat=n) if len(set(p)) == m]
+    return np.array(maps, dtype=np.intp).reshape(-1, n)
+
+
+def voice_leading_matrix(masks: np.ndarray) -> np.ndarray:
+    n = len(masks)
+    pcs = [tuple(i for i in range(12) if int(mask) >> i & 1) for mask in masks]
+    sizes = np.array([len(p) for p in pcs])
+    result = np.zeros((n, n), dtype=np.uint8)
+
+    # Аккорды одного размера считаются одним блоком: расстояния между всеми парами нот,
+    # затем минимум по всем допустимым отображениям голосов
+    for size_a in np.unique(sizes):
+        rows = np.flatnonzero(sizes == size_a)
+        a = np.array([pcs[i] for i in rows], dtype=np.int8).reshape(len(rows), size_a)
+        for size_b in np.unique(sizes):
+            cols = np.flatnonzero(sizes == size_b)
+            b = np.array([pcs[j] for j in cols], dtype=np.int8).reshape(len(cols), size_b)
+            diff = np.abs(a[:, np.newaxis, :, np.newaxis] - b[np.newaxis, :, np.newaxis, :])
+            dist = np.minimum(diff, 12 - diff).astype(np.uint8)  # (строка, столбец, нота a, нота b)
+            if size_a >= size_b:
+                maps = _surjections(size_a, size_b)
+                cost = dist[:, :, np.arange(size_a), maps]
+            else:
+                maps = _surjections(size_b, size_a)
+                cost = dist[:, :, maps, np.arange(size_b)]
+            result[np.ix_(rows, cols)] = cost.sum(axis=-1, dtype=np.uint16).min(axis=-1)
+    return result
+
+
+def _cache_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"voice-leading-{key}.npz")
+
+
+def _load(path: str, masks: np.ndarray) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    try:
+        with np.load(path) as data:
+            if not np.array_equal(data["masks"], masks):
+                return None
+            return data["common"], data["distance"]
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _save(path: str, masks: np.ndarray, common: np.ndarray, distance: np.ndarray) -> None:
+    # Через временный файл: параллельные процессы не увидят недописанный кэш
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".npz")
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, masks=masks, common=common, distance=distance)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def build(chords: Iterable[Chord], use_cache: bool = True) -> VoiceLeading:
+    chords = tuple(chords)
+    masks = np.array([chord.pitch_class_set.mask for chord in chords], dtype=np.uint16)
+    path = _cache_path(vocabulary_hash(chords))
+    cached = _load(path, masks) if use_cache else None
+    if cached is not None:
+        common, distance = cached
+    else:
+        common = common_tone_matrix(masks)
+        distance = voice_leading_matrix(masks)
+        if use_cache:
+            _save(path, masks, common, distance)
+    common.flags.writeable = False
+    distance.flags.writeable = False
+    return VoiceLeading(chords, common, distance)
+
+
+@lru_cache(maxsize=None)
+def voice_leading() -> VoiceLeading:
+    # Общие матрицы процесса по всем зарегистрированным типам аккордов
+    return build(Chord.vocabulary())
+
+
+def _on_quality(chord_quality: ChordQuality) -> None:
+    # Словарь вырос: матрицы пересчитаются (или загрузятся по новому хэшу) при следующем вызове
+    voice_leading.cache_clear()
+
+
+on_quality_registered(_on_quality)
@@ -1,16 +1,64 @@
+import sys
+import time
+_IMPORT_START = time.perf_counter()
+
+# Профилировщик ставится до остальных импортов, чтобы увидеть их все
+from src.utils.startup_profile import ImportProfiler
+_IMPORT_PROFILER = ImportProfiler.install() if any(
+    arg == "--profile-startup" or arg.startswith("--profile-startup=") for arg in sys.argv[1:]
+) else None
+
+import argparse
+import atexit
+import importlib
+import os
+from functools import partial
+from typing import Optional
+
 import flet as ft
 
-from src.core.tone import Tone
+from src.core.chord import QUALITIES
+from src.core.circle_model import BASE_RINGS, circle_model
+from src.core.pitch_class_set import PitchClassSet
 
-from src.ui.circle import Circle
+from src.ui.base_circle import BaseCircle
+from src.ui.event_pipeline import EventPipeline
 from src.ui.options_group import OptionsGroup
 from src.ui.sign_switch import SignSwitch
 from src.ui.tone_column import ToneColumn
+from src.ui.update_batch import UpdateBatch
+from src.utils.instrumentation import REGISTRY, instrument_connection, page_connection
+from src.utils.timing import PhaseTimer
+from src.utils.trace import TraceRecorder
+
+IMPORT_SECONDS = time.perf_counter() - _IMPORT_START
+
 
+# Модули отрисовщиков грузятся только при выборе (flet.canvas нужен лишь второму)
+RENDERERS = {
+    "controls": ("src.ui.circle", "Circle"),
+    "canvas": ("src.ui.canvas_circle", "CanvasCircle")
+}
 
-def main(page: ft.Page):
 
-    def on_switch_change(state: SignSwitch.State) -> None:
+def load_renderer(name: str) -> type[BaseCircle]:
+    module_name, class_name = RENDERERS[name]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+async def main(
+        page: ft.Page,
+        renderer: str = "controls",
+        startup_report: bool = False,
+        profile_startup: Optional[str] = None,
+        record_trace: Optional[str] = None,
+        rings: tuple[str, ...] = ()
+):
+
+    timer = PhaseTimer()
+    timer.record("import", IMPORT_SECONDS)
+
+    def set_spelling(state: SignSwitch.State) -> None:
         if state == SignSwitch.State.SHARPS:
             circle.set_sharps()
             tone_column.set_sharps()
@@ -18,31 +66,69 @@ def main(page: ft.Page):
             circle.set_flats()
             tone_column.set_flats()
 
-    def on_radio_change(state: OptionsGroup.State) -> None:
+    def set_mode(state: OptionsGroup.State) -> None:
         if state == OptionsGroup.State.AXIS:
-            circle.set_mode(Circle.Mode.AXIS)
+            circle.set_mode(BaseCircle.Mode.AXIS)
         elif state == OptionsGroup.State.COMMON:
-            circle.set_mode(Circle.Mode.COMMON)
+            circle.set_mode(BaseCircle.Mode.COMMON)
         elif state == OptionsGroup.State.NEGATIVE:
-            circle.set_mode(Circle.Mode.NEGATIVE)
+            circle.set_mode(BaseCircle.Mode.NEGATIVE)
+        elif state == OptionsGroup.State.PATH:
+            circle.set_mode(BaseCircle.Mode.PATH)
+
+    async def on_switch_change(state: SignSwitch.State) -> None:
+        pipeline.post(set_spelling, state)
 
-    def on_checkbox_change(tones: list[Tone]) -> None:
-        circle.highlight_by_tones(tones)
+    async def on_radio_change(state: OptionsGroup.State) -> None:
+        pipeline.post(set_mode, state)
+
+    async def on_checkbox_change(tones: PitchClassSet) -> None:
+        pipeline.post(circle.highlight_by_tones, tones)
+
+    async def on_resize(e: ft.ControlEvent) -> None:
+        # Справа от круга колонка настроек шириной 195
+        size = min(page.width - 2 * page.padding - 195 - 10, page.height - 2 * page.padding)
+        pipeline.post(circle.resize, size)
 
     page.title = "Circle of Fifths"
     page.theme_mode = "dark"
     page.window_width = 840
     page.window_height = 660
-    page.window_resizable = False
-    page.window_maximizable = False
     page.padding = 10
+    page.on_resize = on_resize
+
+    # Журнал действий сессии для src.bench.replay
+    recorder = None
+    if record_trace:
+        os.makedirs(record_trace, exist_ok=True)
+        recorder = TraceRecorder(os.path.join(record_trace, f"{page.session_id}.jsonl"), rings=rings)
+
+        async def on_close(e: ft.ControlEvent) -> None:
+            recorder.close()
+
+        page.on_close = on_close
 
-    circle = Circle()
+    # Размер отправляемых команд считается на соединении страницы
+    instrument_connection(page_connection(page))
+
+    # Все изменения сессии копятся в одном пакете и уходят через EventPipeline
+    batch = UpdateBatch(deferred=True)
+    pipeline = EventPipeline(batch)
+    circle = load_renderer(renderer)(
+        batch=batch,
+        pipeline=pipeline,
+        recorder=recorder,
+        model=circle_model(rings)
+    )
     switch = SignSwitch(cb_change=on_switch_change)
     radio = OptionsGroup(cb_change=on_radio_change)
-    tone_column = ToneColumn(cb_change=on_checkbox_change)
+    tone_column = ToneColumn(cb_change=on_checkbox_change, batch=batch)
+    timer.mark("build")
 
-    page.add(
+    # Начальное состояние круга и колонки уже заложено в контролы до build()
+    # (пузыри Circle получают его в конструкторе, минуя пакет),
+    # поэтому первый кадр уходит одним сообщением и в пакете ничего не остается
+    await page.add_async(
         ft.Row(
             controls=[
                 circle,
@@ -57,12 +143,46 @@ def main(page: ft.Page):
             vertical_alignment=ft.CrossAxisAlignment.START,
         )
     )
-    circle.set_flats()
-    circle.paint_axis()
-    circle.set_degrees_for_major_tonic()
+    timer.mark("first update")
 
-    page.update()
+    if startup_report:
+        print(timer.report())
+        print(f"pending after first frame: {batch.pending} controls")
+
+    # Профиль пишется один раз, по первой сессии
+    global _IMPORT_PROFILER
+    if profile_startup and _IMPORT_PROFILER is not None:
+        _IMPORT_PROFILER.uninstall()
+        _IMPORT_PROFILER.dump(profile_startup, timer)
+        _IMPORT_PROFILER = None
 
 
 if __name__ == '__main__':
-    ft.app(target=main)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--renderer", choices=RENDERERS, default="controls")
+    parser.add_argument("--rings", nargs="+", default=[], metavar="QUALITY",
+                        choices=[name for name in QUALITIES if name not in BASE_RINGS],
+                        help="extra chord rings inside the minor ring, e.g. dim")
+    parser.add_argument("--startup-report", action="store_true")
+    parser.add_argument("--profile-startup", metavar="FILE")
+    parser.add_argument("--port", type=int, help="serve as a web app on this port without opening a window")
+    parser.add_argument("--record-trace", metavar="DIR", help="write a replayable event log of every session to DIR")
+    parser.add_argument("--metrics", metavar="FILE", help="collect interaction metrics and dump them on exit (.prom or JSON)")
+    args = parser.parse_args()
+    if len(set(args.rings)) != len(args.rings):
+        parser.error("--rings: each ring can be given only once")
+    if args.metrics:
+        REGISTRY.enabled = True
+        atexit.register(REGISTRY.dump, args.metrics)
+    ft.app(
+        target=partial(
+            main,
+            renderer=args.renderer,
+            startup_report=args.startup_report,
+            profile_startup=args.profile_startup,
+            record_trace=args.record_trace,
+            rings=tuple(args.rings)
+        ),
+        port=args.port or 0,
+        view=None if args.port else ft.AppView.FLET_APP
+    )
@@ -0,0 +1,218 @@
+# Разбор корпуса MIDI/MusicXML: каждая пьеса сводится к последовательности аккордов,
+# аккорды находятся на круге (позиция, кольцо, ступень в тональности пьесы),
+# считаются гистограммы переходов по кругу. Файлы обрабатываются пулом процессов,
+# результат пишется построчно в JSONL; повторный запуск продолжает с места остановки
+#     python -m src.tools.analyze_corpus corpus/ --out corpus.jsonl --summary summary.json
+from __future__ import annotations
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Iterator, Optional
+
+from src.core.chord import MajorTriad, MinorTriad
+from src.core.circle_model import CIRCLE_MODEL
+from src.core.circle_state import CircleState
+from src.core.tone import Tone
+from src.utils.lazy import lazy_import
+
+music21 = lazy_import("music21")
+
+EXTENSIONS = (".mid", ".midi", ".xml", ".musicxml", ".mxl")
+
+# Кольца круга в ключах гистограммы переходов
+RINGS = ("M", "m")
+
+# Маска -> индекс аккорда на круге (0..11 мажорное кольцо, 12..23 минорное)
+_BY_MASK = {mask: idx for idx, mask in enumerate(CIRCLE_MODEL.masks)}
+
+
+def iter_scores(root: str) -> Iterator[str]:
+    for directory, dirs, files in os.walk(root):
+        dirs.sort()
+        for name in sorted(files):
+            if name.lower().endswith(EXTENSIONS):
+                yield os.path.join(directory, name)
+
+
+def locate(mask: int) -> Optional[int]:
+    # Трезвучие круга с этой маской, а для более сложных аккордов (септаккорды, нонаккорды) -
+    # единственное трезвучие круга, целиком входящее в аккорд
+    idx = _BY_MASK.get(mask)
+    if idx is not None:
+        return idx
+    found = [idx for idx, triad in enumerate(CIRCLE_MODEL.masks) if triad & mask == triad]
+    return found[0] if len(found) == 1 else None
+
+
+def motion(a: int, b: int) -> str:
+    # Шаг по кругу от a к b: -5..+6 позиций (плюс - против часовой, в сторону субдоминанты)
+    # и смена кольца: "M>m +1" - от мажорного аккорда к минорному на позицию левее
+    delta = (b % 12 - a % 12 + 5) % 12 - 5
+    return f"{RINGS[a // 12]}>{RINGS[b // 12]} {delta:+d}"
+
+
+def analyze(path: str) -> dict:
+    started = time.perf_counter()
+    score = music21.converter.parse(path)
+    key = score.analyze("key")
+
+    # Тоника пьесы на круге: ступени считаются так же, как при клике по ней в режиме осей
+    state = CircleState()
+    tonic = Tone.by_idx(key.tonic.pitchClass)
+    state.click(state.index_of(MajorTriad(tonic) if key.mode == "major" else MinorTriad(tonic)))
+
+    chords = 0
+    located = []
+    for chord in score.chordify().recurse().getElementsByClass("Chord"):
+        mask = 0
+        for pc in chord.pitchClasses:
+            mask |= 1 << pc
+        chords += 1
+        idx = locate(mask)
+        # Повтор аккорда - не переход
+        if idx is not None and (not located or located[-1] != idx):
+            located.append(idx)
+
+    labels = CIRCLE_MODEL.sharp_labels
+    return {
+        "path": path,
+        "key": f"{tonic.sharp_name} {key.mode}",
+        "chords": chords,
+        "located": len(located),
+        "positions": dict(Counter(labels[idx] for idx in located)),
+        "degrees": dict(Counter(state.degree(idx) or "other" for idx in located)),
+        "motion": dict(Counter(motion(a, b) for a, b in zip(located, located[1:]))),
+        "seconds": round(time.perf_counter() - started, 3)
+    }
+
+
+def _analyze_safe(path: str) -> dict:
+    try:
+        return analyze(path)
+    except Exception as e:
+        return {"path": path, "error": f"{type(e).__name__}: {e}"}
+
+
+def _done(out: str) -> set[str]:
+    # Уже обработанные файлы (в том числе с ошибкой) при продолжении прерванного запуска
+    done = set()
+    if not os.path.exists(out):
+        return done
+    _drop_partial_line(out)
+    with open(out, encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["path"])
+            except (ValueError, KeyError):
+                continue
+    return done
+
+
+def _drop_partial_line(out: str) -> None:
+    # Оборванная последняя строка отрезается до последнего перевода строки: иначе
+    # следующая запись допишется прямо к ней и тоже не прочитается. Ее файл будет разобран заново
+    with open(out, "rb+") as f:
+        size = end = f.seek(0, os.SEEK_END)
+        while end > 0:
+            start = max(end - 4096, 0)
+            f.seek(start)
+            newline = f.read(end - start).rfind(b"\n")
+            if newline >= 0:
+                end = start + newline + 1
+                break
+            end = start
+        if end != size:
+            f.truncate(end)
+
+
+def run(root: str, out: str, workers: int, max_pending: int, tasks_per_worker: int) -> tuple[int, int]:
+    done = _done(out)
+    processed = errors = 0
+    with open(out, "a", encoding="utf-8") as f, ProcessPoolExecutor(
+        max_workers=workers,
+        max_tasks_per_child=tasks_per_worker
+    ) as pool:
+        pending: set[Future] = set()
+
+        def collect(block: bool) -> None:
+            nonlocal pending, processed, errors
+            finished, pending = wait(pending, timeout=None if block else 0, return_when=FIRST_COMPLETED)
+            for future in finished:
+                record = future.result()
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                processed += 1
+                errors += "error" in record
+            f.flush()
+
+        # Файлы подаются в пул порциями: в памяти не больше max_pending задач и результатов
+        for path in iter_scores(root):
+            if path in done:
+                continue
+            if len(pending) >= max_pending:
+                collect(block=True)
+            pending.add(pool.submit(_analyze_safe, path))
+        while pending:
+            collect(block=True)
+    return processed, errors
+
+
+def summarize(out: str) -> dict:
+    # Общие гистограммы по всему файлу результатов, включая записи прошлых запусков
+    summary = {"pieces": 0, "errors": 0, "chords": 0, "located": 0}
+    histograms = {"positions": Counter(), "degrees": Counter(), "motion": Counter(), "keys": Counter()}
+    with open(out, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if "error" in record:
+                summary["errors"] += 1
+                continue
+            summary["pieces"] += 1
+            summary["chords"] += record["chords"]
+            summary["located"] += record["located"]
+            histograms["keys"][record["key"]] += 1
+            for name in ("positions", "degrees", "motion"):
+                histograms[name].update(record[name])
+    for name, counter in histograms.items():
+        summary[name] = dict(counter.most_common())
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("root", help="directory with MIDI/MusicXML files")
+    parser.add_argument("--out", default="corpus.jsonl", help="per-piece results, appended on resume")
+    parser.add_argument("--summary", metavar="FILE", help="aggregate histograms as JSON (stdout by default)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--max-pending", type=int, default=0, help="files in flight, 4 per worker by default")
+    parser.add_argument("--tasks-per-worker", type=int, default=200,
+                        help="restart worker processes after this many files to bound memory")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    processed, errors = run(
+        args.root,
+        args.out,
+        workers=args.workers,
+        max_pending=args.max_pending or 4 * args.workers,
+        tasks_per_worker=args.tasks_per_worker
+    )
+    elapsed = time.perf_counter() - started
+    print(f"{processed} files ({errors} errors) in {elapsed:.1f} s", file=sys.stderr)
+
+    summary = json.dumps(summarize(args.out), ensure_ascii=False, indent=2)
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as f:
+            f.write(summary)
+    else:
+        print(summary)
+
+
+if __name__ == "__main__":
+    main()
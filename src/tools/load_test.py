@@ -0,0 +1,318 @@
+# Нагрузочный тест веб-версии: запускает src.main как локальный веб-сервер Flet
+# и гоняет по WebSocket N одновременных клиентов со сценарием действий.
+# Клиент говорит на протоколе веб-клиента Flet (registerWebClient, updateControlProps,
+# pageEventFromWeb по /ws); проверено на Flet 0.19
+#     python -m src.tools.load_test --clients 50 --rounds 5
+from __future__ import annotations
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import websockets
+
+
+# Шаги сценария: ("click", подпись аккорда), ("mode", axis|common|negative|path),
+# ("sharps", true|false), ("check", подпись ноты, true|false)
+DEFAULT_TRACE: list[list[Any]] = [
+    ["click", "G"],
+    ["click", "Am"],
+    ["mode", "common"],
+    ["click", "C"],
+    ["sharps", True],
+    ["check", "E", True],
+    ["check", "G", True],
+    ["mode", "negative"],
+    ["click", "E"],
+    ["check", "E", False],
+    ["check", "G", False],
+    ["sharps", False],
+    ["mode", "axis"],
+    ["click", "C"]
+]
+
+_TAP_DATA = json.dumps({"lx": 45, "ly": 45, "gx": 45, "gy": 45})
+
+# Тишина после последнего сообщения сервера, после которой действие считается отрисованным
+QUIET_PERIOD = 0.1
+MAX_WAIT = 5.0
+
+
+@dataclass
+class Interaction:
+    step: str
+    latency: float  # до первого ответного сообщения
+    messages: int
+    bytes: int
+
+
+@dataclass
+class ClientResult:
+    interactions: list[Interaction] = field(default_factory=list)
+    registered: bool = False
+    error: Optional[str] = None
+
+
+class _Controls:
+
+    # Индекс контролов сессии по сообщениям сервера: id -> свойства
+    def __init__(self):
+        self.by_id: dict[str, dict] = {}
+
+    def feed(self, message: Any) -> None:
+        # Формат пакетов разный для разных action, поэтому ищем описания
+        # контролов ({"i": id, "t": тип, ...}) в любом месте сообщения
+        if isinstance(message, dict):
+            control_id = message.get("i")
+            if isinstance(control_id, str) and ("t" in message or control_id in self.by_id):
+                self.by_id.setdefault(control_id, {}).update(message)
+            for value in message.values():
+                self.feed(value)
+        elif isinstance(message, list):
+            for item in message:
+                self.feed(item)
+
+    def find(self, control_type: str, **attrs) -> Optional[str]:
+        for control_id, props in self.by_id.items():
+            if props.get("t") != control_type:
+                continue
+            if all(str(props.get(k)).lower() == str(v).lower() for k, v in attrs.items()):
+                return control_id
+        return None
+
+    def bubble(self, label: str) -> Optional[str]:
+        # Пузырь - кликабельный container, у которого дочерний text с подписью аккорда
+        for control_id, props in self.by_id.items():
+            if props.get("t") == "text" and props.get("value") == label:
+                parent = self.by_id.get(props.get("p", ""))
+                if parent is not None and parent.get("t") == "container":
+                    return parent["i"]
+        return None
+
+
+class Client:
+
+    def __init__(self, url: str, trace: list[list[Any]]):
+        self._url = url
+        self._trace = trace
+        self._controls = _Controls()
+        self._ws = None
+
+    async def run(self, rounds: int, connected: Optional[asyncio.Barrier] = None) -> ClientResult:
+        # connected - барьер, на котором все клиенты ждут, пока замеряется память
+        # сервера с открытыми сессиями; клиент с ошибкой подключения тоже до него доходит
+        result = ClientResult()
+        try:
+            async with websockets.connect(self._url, max_size=None) as ws:
+                self._ws = ws
+                await self._register()
+                result.registered = True
+                if connected is not None:
+                    await connected.wait()
+                for _ in range(rounds):
+                    for step in self._trace:
+                        interaction = await self._perform(step)
+                        if interaction is not None:
+                            result.interactions.append(interaction)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            if not result.registered and connected is not None:
+                await connected.wait()
+        return result
+
+    async def _send(self, action: str, payload: dict) -> None:
+        await self._ws.send(json.dumps({"action": action, "payload": payload}))
+
+    async def _register(self) -> None:
+        await self._send("registerWebClient", {
+            "pageName": "",
+            "pageRoute": "/",
+            "pageWidth": "840",
+            "pageHeight": "660",
+            "windowWidth": "840",
+            "windowHeight": "660",
+            "windowTop": "0",
+            "windowLeft": "0",
+            "isPWA": "false",
+            "isWeb": "true",
+            "isDebug": "false",
+            "platform": "linux",
+            "platformBrightness": "dark",
+            "media": "{}",
+            "sessionId": ""
+        })
+        # Ждем первый кадр: дерево контролов с пузырями
+        deadline = time.perf_counter() + MAX_WAIT * 4
+        while self._controls.bubble("C") is None:
+            timeout = deadline - time.perf_counter()
+            if timeout <= 0:
+                raise TimeoutError("first frame was not received")
+            self._controls.feed(json.loads(await asyncio.wait_for(self._ws.recv(), timeout)))
+
+    async def _event(self, target: str, name: str, data: str = "") -> None:
+        await self._send("pageEventFromWeb", {"eventTarget": target, "eventName": name, "eventData": data})
+
+    async def _perform(self, step: list[Any]) -> Optional[Interaction]:
+        kind = step[0]
+        controls = self._controls
+        started = time.perf_counter()
+
+        if kind == "click":
+            target = controls.bubble(step[1])
+            if target is None:
+                return None
+            started = time.perf_counter()
+            # Клик по Container несет координаты касания (ContainerTapEvent), без них обработчик падает
+            await self._event(target, "click", _TAP_DATA)
+        elif kind == "mode":
+            target = controls.find("radiogroup")
+            if target is None:
+                return None
+            started = time.perf_counter()
+            await self._send("updateControlProps", {"props": [{"i": target, "value": step[1]}]})
+            await self._event(target, "change", step[1])
+        elif kind == "sharps":
+            target = controls.find("switch")
+            if target is None:
+                return None
+            value = "true" if step[1] else "false"
+            started = time.perf_counter()
+            await self._send("updateControlProps", {"props": [{"i": target, "value": value}]})
+            await self._event(target, "change", value)
+        elif kind == "check":
+            target = controls.find("checkbox", label=step[1])
+            if target is None:
+                return None
+            value = "true" if step[2] else "false"
+            started = time.perf_counter()
+            await self._send("updateControlProps", {"props": [{"i": target, "value": value}]})
+            await self._event(target, "change", value)
+        else:
+            raise ValueError(f"unknown step {step!r}")
+
+        return await self._collect(" ".join(map(str, step)), started)
+
+    async def _collect(self, step: str, started: float) -> Interaction:
+        latency = None
+        messages = 0
+        size = 0
+        deadline = started + MAX_WAIT
+        while True:
+            timeout = QUIET_PERIOD if latency is not None else deadline - time.perf_counter()
+            if timeout <= 0:
+                break
+            try:
+                raw = await asyncio.wait_for(self._ws.recv(), timeout)
+            except asyncio.TimeoutError:
+                break
+            if latency is None:
+                latency = time.perf_counter() - started
+            messages += 1
+            size += len(raw)
+            self._controls.feed(json.loads(raw))
+        return Interaction(step, latency if latency is not None else float("nan"), messages, size)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_bytes(pid: int) -> int:
+    # RSS процесса приложения из /proc (только Linux)
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+async def _wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"server did not start on port {port}")
+            await asyncio.sleep(0.2)
+
+
+def _percentile(values: list[float], q: int) -> float:
+    if len(values) < 2:
+        return values[0] if values else float("nan")
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+async def run(clients: int, rounds: int, trace: list[list[Any]], renderer: str, ramp: float) -> dict:
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "src.main", "--port", str(port), "--renderer", renderer],
+        cwd=os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    )
+    try:
+        await _wait_for_port(port, timeout=60)
+        await asyncio.sleep(1)
+        rss_before = _rss_bytes(server.pid)
+
+        url = f"ws://127.0.0.1:{port}/ws"
+        connected = asyncio.Barrier(clients + 1)
+        tasks = []
+        for _ in range(clients):
+            tasks.append(asyncio.create_task(Client(url, trace).run(rounds, connected)))
+            await asyncio.sleep(ramp)
+        # Память замеряется, пока все сессии открыты и сценарии еще не начались
+        await connected.wait()
+        rss_connected = _rss_bytes(server.pid)
+        results = await asyncio.gather(*tasks)
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+    interactions = [i for r in results for i in r.interactions]
+    latencies = [i.latency for i in interactions if i.latency == i.latency]
+    errors = [r.error for r in results if r.error]
+    return {
+        "clients": clients,
+        "interactions": len(interactions),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "latency_p50_ms": _percentile(latencies, 50) * 1000,
+        "latency_p99_ms": _percentile(latencies, 99) * 1000,
+        "messages_per_interaction": statistics.fmean(i.messages for i in interactions) if interactions else 0,
+        "bytes_per_interaction": statistics.fmean(i.bytes for i in interactions) if interactions else 0,
+        "rss_per_session_kb": (rss_connected - rss_before) / max(sum(r.registered for r in results), 1) / 1024
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--trace", help="JSON file with a list of steps, see DEFAULT_TRACE")
+    # Сценарий находит пузыри по контролам Container/Text, у CanvasCircle их нет
+    parser.add_argument("--renderer", default="controls", choices=("controls",))
+    parser.add_argument("--ramp", type=float, default=0.01, help="delay between client connections, s")
+    args = parser.parse_args()
+
+    trace = DEFAULT_TRACE
+    if args.trace:
+        with open(args.trace, encoding="utf-8") as f:
+            trace = json.load(f)
+
+    report = asyncio.run(run(args.clients, args.rounds, trace, args.renderer, args.ramp))
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
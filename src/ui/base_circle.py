@@ -0,0 +1,179 @@
+from __future__ import annotations
+from typing import Optional
+
+import flet as ft
+
+from src.core.circle_model import CIRCLE_MODEL, CircleModel
+from src.core.circle_state import CircleState, Mode, Spelling
+from src.core.pitch_class_set import PitchClassSet
+from src.ui.event_pipeline import EventPipeline
+from src.ui.hover_coalescer import HoverCoalescer
+from src.ui.update_batch import UpdateBatch, batched
+from src.utils import trace
+from src.utils.instrumentation import instrumented
+from src.utils.layout import ring_centers
+
+
+class BaseCircle(ft.UserControl):
+
+    # Общая часть отрисовщиков круга: состояние, пакет обновлений, раскладка колец.
+    # Аккорды нумеруются как в CircleState: 0..11 - мажорное кольцо, 12..23 - минорное,
+    # дальше дополнительные кольца модели, каждое внутри предыдущего
+    Mode = Mode
+
+    MIN_SIZE = 400
+    MAJOR_BUBBLE_RADIUS = 45
+    MINOR_BUBBLE_RADIUS = 40
+    EXTRA_BUBBLE_RADIUS = 30
+    FONT_SIZES = (32, 26, 18)  # мажорное, минорное, дополнительные кольца
+    EXTRA_RING_STEP = 65  # расстояние между дополнительными кольцами
+
+    def __init__(
+            self,
+            batch: Optional[UpdateBatch] = None,
+            pipeline: Optional[EventPipeline] = None,
+            size: float = 600,
+            hover_window: float = 0.016,
+            recorder: Optional[trace.TraceRecorder] = None,
+            model: CircleModel = CIRCLE_MODEL
+    ) -> None:
+
+        super(BaseCircle, self).__init__()
+        # Каждое дополнительное кольцо забирает EXTRA_RING_STEP с обеих сторон от центра
+        self._min_size = self.MIN_SIZE + 2 * self.EXTRA_RING_STEP * (len(model.rings) - 2)
+        self._size = max(size, self._min_size)
+        self._state = CircleState(model)
+        self._batch = batch or UpdateBatch(deferred=True)
+        self._pipeline = pipeline or EventPipeline(self._batch)
+        self._recorder = recorder
+        self._hover = HoverCoalescer(
+            lambda degree: self._pipeline.post(self._apply_degree, degree),
+            window=hover_window,
+            schedule=self._pipeline.call_later
+        )
+
+        # Центры (top, left) позиций на кольцах, позиция 0 - верх
+        self._centers: tuple[tuple[tuple[float, float], ...], ...] = ()
+        self._layout()
+
+    @property
+    def state(self) -> CircleState:
+        return self._state
+
+    @property
+    def size(self) -> float:
+        return self._size
+
+    @property
+    def hover(self) -> HoverCoalescer:
+        return self._hover
+
+    def batch(self) -> UpdateBatch:
+        return self._batch
+
+    @property
+    def model(self) -> CircleModel:
+        return self._state.model
+
+    def center_of(self, idx: int) -> tuple[float, float]:
+        return self._centers[idx // 12][self._state.slot(idx)]
+
+    def radius_of(self, idx: int) -> float:
+        if idx < 12:
+            return self.MAJOR_BUBBLE_RADIUS
+        if idx < 24:
+            return self.MINOR_BUBBLE_RADIUS
+        return self.EXTRA_BUBBLE_RADIUS
+
+    def font_size_of(self, idx: int) -> float:
+        return self.FONT_SIZES[min(idx // 12, 2)]
+
+    @instrumented("circle.set_mode")
+    @batched
+    def set_mode(self, mode: Mode) -> None:
+        self._record(trace.MODE, mode.name)
+        self._state.set_mode(mode)
+        self._render()
+
+    @instrumented("circle.set_sharps")
+    @batched
+    def set_sharps(self) -> None:
+        self._record(trace.SPELLING, Spelling.SHARPS.name)
+        self._state.set_spelling(Spelling.SHARPS)
+        self._render()
+
+    @instrumented("circle.set_flats")
+    @batched
+    def set_flats(self) -> None:
+        self._record(trace.SPELLING, Spelling.FLATS.name)
+        self._state.set_spelling(Spelling.FLATS)
+        self._render()
+
+    @instrumented("circle.highlight_by_tones")
+    @batched
+    def highlight_by_tones(self, tones: PitchClassSet) -> None:
+        self._record(trace.TONES, tones.mask)
+        self._state.select(tones)
+        self._render()
+
+    @instrumented("circle.resize")
+    @batched
+    def resize(self, size: float) -> None:
+        self._record(trace.RESIZE, size)
+        size = max(size, self._min_size)
+        if size == self._size:
+            return
+        self._size = size
+        self._layout()
+        self._render()
+
+    def _record(self, kind: str, value) -> None:
+        if self._recorder is not None:
+            self._recorder.record(kind, value)
+
+    def _layout(self) -> None:
+        half = self._size / 2
+        major_r = half - 50
+        minor_r = major_r - 75
+        extra_r = tuple(minor_r - self.EXTRA_RING_STEP * k for k in range(1, len(self.model.rings) - 1))
+        self._centers = ring_centers(
+            center=(half, half),
+            radii=(major_r, minor_r, *extra_r),
+            n=12
+        )
+
+    # Переопределяются отрисовщиками (Circle, CanvasCircle)
+
+    def _render(self) -> None:
+        # Реализации оборачиваются в @instrumented("circle.render")
+        raise NotImplementedError(f"{type(self).__name__} must implement _render")
+
+    def _show_degree(self, degree: str) -> None:
+        raise NotImplementedError(f"{type(self).__name__} must implement _show_degree")
+
+    def _hide_degree(self) -> None:
+        raise NotImplementedError(f"{type(self).__name__} must implement _hide_degree")
+
+    @instrumented("circle.click")
+    @batched
+    def _on_chord_click(self, idx: int) -> None:
+        self._record(trace.CLICK, idx)
+        self._state.click(idx)
+        self._render()
+
+    def _on_chord_hover_begin(self, idx: int) -> None:
+        if self._state.mode != Mode.AXIS:
+            return
+        self._hover.push(self._state.degree(idx))
+
+    def _on_chord_hover_end(self) -> None:
+        if self._state.mode != Mode.AXIS:
+            return
+        self._hover.push(None)
+
+    @batched
+    def _apply_degree(self, degree: Optional[str]) -> None:
+        if degree:
+            self._show_degree(degree)
+        else:
+            self._hide_degree()
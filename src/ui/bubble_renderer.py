@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from src.ui.chord_bubble import BubbleState, ChordBubble
+from src.ui.update_batch import UpdateBatch
+
+
+class BubbleRenderer:
+
+    # Копит целевые состояния пузырей и при сбросе пакета отдает в него
+    # только те пузыри, у которых что-то изменилось с последней отправки
+    def __init__(self, batch: UpdateBatch):
+        self._batch = batch
+        self._targets: dict[ChordBubble, BubbleState] = {}
+
+    def state(self, bubble: ChordBubble) -> BubbleState:
+        return self._targets.get(bubble, bubble.state)
+
+    def render(self, bubble: ChordBubble, **changes) -> None:
+        self._targets[bubble] = self.state(bubble)._replace(**changes)
+        self._batch.add_source(self)
+
+    def dirty_controls(self) -> list[ChordBubble]:
+        dirty = []
+        for bubble, target in self._targets.items():
+            if target != bubble.state:
+                bubble.apply(target)
+                # Еще не построенный пузырь возьмет состояние в build()
+                if bubble.controls:
+                    dirty.append(bubble)
+        self._targets.clear()
+        return dirty
@@ -0,0 +1,180 @@
+from __future__ import annotations
+from typing import Optional
+
+import flet as ft
+import flet.canvas as cv
+
+from src.core.circle_model import CIRCLE_MODEL, CircleModel
+from src.ui.base_circle import BaseCircle
+from src.ui.event_pipeline import EventPipeline
+from src.ui.update_batch import UpdateBatch
+from src.utils.instrumentation import instrumented
+from src.utils.trace import TraceRecorder
+
+
+class CanvasCircle(BaseCircle):
+
+    # Круг, нарисованный фигурами на одном Canvas: один контрол на весь круг,
+    # попадание курсора по аккорду определяется по таблице раскладки
+    def __init__(
+            self,
+            batch: Optional[UpdateBatch] = None,
+            pipeline: Optional[EventPipeline] = None,
+            size: float = 600,
+            hover_window: float = 0.016,
+            recorder: Optional[TraceRecorder] = None,
+            model: CircleModel = CIRCLE_MODEL
+    ) -> None:
+        super(CanvasCircle, self).__init__(
+            batch=batch,
+            pipeline=pipeline,
+            size=size,
+            hover_window=hover_window,
+            recorder=recorder,
+            model=model
+        )
+        self._canvas: Optional[cv.Canvas] = None
+        self._hovered: Optional[int] = None
+        self._degree: Optional[str] = None
+        self._rendered_key: Optional[tuple] = None
+
+    @property
+    def canvas(self) -> Optional[cv.Canvas]:
+        return self._canvas
+
+    def build(self) -> cv.Canvas:
+        self._canvas = cv.Canvas(
+            shapes=self._shapes(),
+            width=self._size,
+            height=self._size,
+            content=ft.GestureDetector(
+                on_tap_down=self._on_tap_down,
+                on_hover=self._on_hover,
+                on_exit=self._on_exit
+            )
+        )
+        self._rendered_key = self._render_key()
+        return self._canvas
+
+    def hit_test(self, x: float, y: float) -> Optional[int]:
+        for idx in range(len(self.model.chords)):
+            top, left = self.center_of(idx)
+            radius = self.radius_of(idx)
+            if (x - left) ** 2 + (y - top) ** 2 <= radius ** 2:
+                return idx
+        return None
+
+    def _render_key(self) -> tuple:
+        state = self._state
+        return (
+            self._size,
+            state.offset,
+            state.colors(),
+            state.labels(),
+            state.highlighted(),
+            state.tonics(),
+            self._degree
+        )
+
+    @instrumented("circle.render")
+    def _render(self) -> None:
+        # Все изменения круга уходят одним обновлением Canvas
+        if self._canvas is None:
+            return
+        key = self._render_key()
+        if key == self._rendered_key:
+            return
+        self._rendered_key = key
+        self._canvas.width = self._canvas.height = self._size
+        self._canvas.shapes = self._shapes()
+        self._batch.add(self._canvas)
+
+    def _shapes(self) -> list[cv.Shape]:
+        size = self._size
+        half = size / 2
+        state = self._state
+        labels = state.labels()
+        colors = state.colors()
+        highlighted = state.highlighted()
+        tonics = state.tonics()
+
+        shapes = [
+            cv.Rect(0, 0, size, size, paint=self._fill(ft.colors.BLUE_GREY_200)),
+            cv.Circle(half, half, half - 20, paint=self._fill(ft.colors.BLUE_GREY_100)),
+            cv.Circle(half, half, size / 4, paint=self._fill(ft.colors.BLUE_GREY_200))
+        ]
+
+        if self._degree:
+            shapes += [
+                cv.Circle(half, half, 30, paint=self._stroke(ft.colors.with_opacity(0.5, ft.colors.BLUE_GREY_900), 2)),
+                cv.Text(
+                    half, half, self._degree,
+                    style=ft.TextStyle(
+                        size=24,
+                        weight=ft.FontWeight.BOLD,
+                        color=ft.colors.with_opacity(0.5, ft.colors.BLUE_GREY_900)
+                    ),
+                    alignment=ft.alignment.center
+                )
+            ]
+
+        for idx in range(len(self.model.chords)):
+            top, left = self.center_of(idx)
+            radius = self.radius_of(idx)
+            shapes += [
+                cv.Circle(left, top, radius, paint=self._fill(colors[idx])),
+                cv.Circle(
+                    left, top, radius,
+                    paint=(
+                        self._stroke(ft.colors.YELLOW, 8)
+                        if highlighted[idx] else
+                        self._stroke(ft.colors.WHITE, 2)
+                    )
+                ),
+                cv.Text(
+                    left, top, labels[idx],
+                    style=ft.TextStyle(
+                        size=self.font_size_of(idx),
+                        weight=ft.FontWeight.BOLD,
+                        color=ft.colors.YELLOW if tonics[idx] else ft.colors.WHITE
+                    ),
+                    alignment=ft.alignment.center
+                )
+            ]
+        return shapes
+
+    @staticmethod
+    def _fill(color: str) -> ft.Paint:
+        return ft.Paint(color=color, style=ft.PaintingStyle.FILL)
+
+    @staticmethod
+    def _stroke(color: str, width: float) -> ft.Paint:
+        return ft.Paint(color=color, stroke_width=width, style=ft.PaintingStyle.STROKE)
+
+    def _show_degree(self, degree: str) -> None:
+        self._degree = degree
+        self._render()
+
+    def _hide_degree(self) -> None:
+        self._degree = None
+        self._render()
+
+    async def _on_tap_down(self, e: ft.TapEvent) -> None:
+        idx = self.hit_test(e.local_x, e.local_y)
+        if idx is not None:
+            self._pipeline.post(self._on_chord_click, idx)
+
+    async def _on_hover(self, e: ft.HoverEvent) -> None:
+        idx = self.hit_test(e.local_x, e.local_y)
+        if idx == self._hovered:
+            return
+        self._hovered = idx
+        if idx is None:
+            self._on_chord_hover_end()
+        else:
+            self._on_chord_hover_begin(idx)
+
+    async def _on_exit(self, e: ft.HoverEvent) -> None:
+        if self._hovered is not None:
+            self._hovered = None
+            self._on_chord_hover_end()
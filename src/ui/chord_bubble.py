@@ -1,8 +1,18 @@
-from typing import Callable, Optional
+from typing import Callable, NamedTuple, Optional
 
 import flet as ft
 
-from src.core.chord import Chord, MajorTriad
+from src.core.chord import Chord
+
+
+class BubbleState(NamedTuple):
+    label: str
+    tooltip: Optional[str] = None
+    bgcolor: Optional[str] = None
+    highlighted: bool = False
+    tonic: bool = False  # тоника лада, содержащего выбранные ноты
+    top: Optional[float] = None
+    left: Optional[float] = None
 
 
 class ChordBubble(ft.UserControl):
@@ -12,12 +22,16 @@ class ChordBubble(ft.UserControl):
             chord: Chord,
             cb_click: Callable,
             cb_hover_begin: Callable,
-            cb_hover_end: Callable
+            cb_hover_end: Callable,
+            radius: float = 45,
+            font_size: float = 32
     ) -> None:
 
         super(ChordBubble, self).__init__(animate_position=666)
         self._chord = chord
-        self.degree: Optional[str] = None
+        self._radius = radius
+        self._font_size = font_size
+        self._state = BubbleState(label=chord.flat_name)
         self.cb_click = cb_click
         self.cb_hover_begin = cb_hover_begin
         self.cb_hover_end = cb_hover_end
@@ -30,18 +44,25 @@ class ChordBubble(ft.UserControl):
     def container(self) -> ft.Container:
         return self.controls[0]
 
+    @property
+    def state(self) -> BubbleState:
+        return self._state
+
     def build(self) -> ft.Container:
-        big = isinstance(self._chord, MajorTriad)
+        state = self._state
         return ft.Container(
-            width=(90 if big else 80),
-            height=(90 if big else 80),
-            border=ft.border.all(2, ft.colors.WHITE),
-            border_radius=(45 if big else 40),
+            width=2 * self._radius,
+            height=2 * self._radius,
+            bgcolor=state.bgcolor,
+            border=self._border(state.highlighted),
+            border_radius=self._radius,
             alignment=ft.alignment.center,
+            tooltip=state.tooltip,
             content=ft.Text(
-                value=self._chord.flat_name,
-                size=(32 if big else 26),
+                value=state.label,
+                size=self._font_size,
                 weight=ft.FontWeight.BOLD,
+                color=self._label_color(state.tonic),
                 data={}
             ),
             on_click=self._on_click,
@@ -49,19 +70,42 @@ class ChordBubble(ft.UserControl):
             animate=666
         )
 
-    def highlight_on(self) -> None:
-        self.container.border = ft.border.all(8, ft.colors.YELLOW)
-        self.container.update()
+    def apply(self, state: BubbleState) -> None:
+        # Переносит на контролы только отличающиеся от текущих свойства
+        prev, self._state = self._state, state
+        if state.top != prev.top:
+            self.top = state.top
+        if state.left != prev.left:
+            self.left = state.left
+        if not self.controls:
+            return
+        container = self.container
+        if state.label != prev.label:
+            container.content.value = state.label
+        if state.tooltip != prev.tooltip:
+            container.tooltip = state.tooltip
+        if state.bgcolor != prev.bgcolor:
+            container.bgcolor = state.bgcolor
+        if state.highlighted != prev.highlighted:
+            container.border = self._border(state.highlighted)
+        if state.tonic != prev.tonic:
+            container.content.color = self._label_color(state.tonic)
+
+    @staticmethod
+    def _border(highlighted: bool) -> ft.Border:
+        if highlighted:
+            return ft.border.all(8, ft.colors.YELLOW)
+        return ft.border.all(2, ft.colors.WHITE)
 
-    def highlight_off(self) -> None:
-        self.container.border = ft.border.all(2, ft.colors.WHITE)
-        self.container.update()
+    @staticmethod
+    def _label_color(tonic: bool) -> Optional[str]:
+        return ft.colors.YELLOW if tonic else None
 
-    def _on_click(self, e: ft.ControlEvent) -> None:
-        self.cb_click(self)
+    async def _on_click(self, e: ft.ControlEvent) -> None:
+        await self.cb_click(self)
 
-    def _on_hover(self, e: ft.ControlEvent) -> None:
+    async def _on_hover(self, e: ft.ControlEvent) -> None:
         if e.data == "true":
-            self.cb_hover_begin(self)
+            await self.cb_hover_begin(self)
         else:
-            self.cb_hover_end(self)
+            await self.cb_hover_end(self)
@@ -0,0 +1,57 @@
+from __future__ import annotations
+import asyncio
+from typing import Callable, Optional
+
+from src.ui.update_batch import UpdateBatch
+
+
+class EventPipeline:
+
+    # Один на сессию. Обработчик события сразу меняет состояние и отмечает
+    # измененные контролы в общем отложенном пакете, а отправка идет отдельной задачей.
+    # Новое событие отменяет еще не начавшуюся отправку: ее контролы уйдут
+    # вместе с новыми, так что на экран попадает только последнее состояние
+    def __init__(self, batch: UpdateBatch):
+        self._batch = batch
+        self._pending: Optional[asyncio.Task] = None
+        self._sending: Optional[asyncio.Future] = None
+        self.events_posted = 0
+        self.renders_cancelled = 0
+        self.renders_sent = 0
+
+    @property
+    def batch(self) -> UpdateBatch:
+        return self._batch
+
+    def post(self, handler: Callable, *args) -> None:
+        with self._batch:
+            handler(*args)
+        self.events_posted += 1
+        if self._pending is not None and not self._pending.done():
+            self._pending.cancel()
+            self.renders_cancelled += 1
+        self._pending = asyncio.get_running_loop().create_task(self._render())
+
+    def call_later(self, delay: float, callback: Callable) -> None:
+        asyncio.get_running_loop().call_later(delay, callback)
+
+    async def drain(self) -> None:
+        while self._pending is not None and not self._pending.done():
+            try:
+                await self._pending
+            except asyncio.CancelledError:
+                pass
+        if self._sending is not None:
+            await self._sending
+
+    async def _render(self) -> None:
+        # Даем событиям, пришедшим в этот же тик, заменить эту отправку
+        await asyncio.sleep(0)
+        while self._sending is not None and not self._sending.done():
+            await asyncio.shield(self._sending)
+
+        # Дальше отправка уже не отменяется
+        self._pending = None
+        self._sending = asyncio.ensure_future(self._batch.flush_async())
+        await self._sending
+        self.renders_sent += 1
@@ -0,0 +1,60 @@
+from __future__ import annotations
+import threading
+from typing import Callable, Optional
+
+
+_NOTHING = object()
+
+
+class HoverCoalescer:
+
+    # Схлопывает переходы наведения за окно window (в секундах) в одно итоговое
+    # состояние: emit вызывается не чаще раза за окно и только если ступень изменилась
+    def __init__(
+            self,
+            emit: Callable[[Optional[str]], None],
+            window: float = 0.016,
+            schedule: Optional[Callable[[float, Callable], None]] = None
+    ) -> None:
+
+        self._emit = emit
+        self._window = window
+        self._schedule = schedule or self._schedule_timer
+        self._lock = threading.Lock()
+        self._pending = _NOTHING
+        self._armed = False
+        self._last: Optional[str] = None
+        self.events_received = 0
+        self.events_emitted = 0
+
+    @property
+    def events_dropped(self) -> int:
+        return self.events_received - self.events_emitted
+
+    def push(self, degree: Optional[str]) -> None:
+        with self._lock:
+            self.events_received += 1
+            self._pending = degree
+            if self._armed:
+                return
+            self._armed = True
+        if self._window > 0:
+            self._schedule(self._window, self.flush)
+        else:
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            degree, self._pending = self._pending, _NOTHING
+            self._armed = False
+            if degree is _NOTHING or degree == self._last:
+                return
+            self._last = degree
+            self.events_emitted += 1
+        self._emit(degree)
+
+    @staticmethod
+    def _schedule_timer(delay: float, callback: Callable) -> None:
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
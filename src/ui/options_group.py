@@ -10,6 +10,7 @@ class OptionsGroup(ft.UserControl):
         AXIS = auto()  # Функциональные оси
         COMMON = auto()  # Общие ноты
         NEGATIVE = auto()  # Негативная гармония
+        PATH = auto()  # Цепочка P/L/R между двумя аккордами
 
     def __init__(self, cb_change: Callable):
         super(OptionsGroup, self).__init__()
@@ -20,17 +21,20 @@ class OptionsGroup(ft.UserControl):
             content=ft.Column([
                 ft.Radio(value="axis", label="Functional Axis"),
                 ft.Radio(value="common", label="Common Notes"),
-                ft.Radio(value="negative", label="Negative Harmony")
+                ft.Radio(value="negative", label="Negative Harmony"),
+                ft.Radio(value="path", label="PLR Path")
             ]),
             value="axis",
             on_change=self._on_change
         )
 
-    def _on_change(self, e: ft.ControlEvent):
+    async def _on_change(self, e: ft.ControlEvent):
         value = e.control.value
         if value == "axis":
-            self.cb_change(self.State.AXIS)
+            await self.cb_change(self.State.AXIS)
         elif value == "common":
-            self.cb_change(self.State.COMMON)
+            await self.cb_change(self.State.COMMON)
         elif value == "negative":
-            self.cb_change(self.State.NEGATIVE)
+            await self.cb_change(self.State.NEGATIVE)
+        elif value == "path":
+            await self.cb_change(self.State.PATH)
@@ -28,7 +28,7 @@ class SignSwitch(ft.UserControl):
             on_change=self._on_change
         )
 
-    def _on_change(self, e: ft.ControlEvent):
+    async def _on_change(self, e: ft.ControlEvent):
         self.switch.label = "Flats" if self.state == self.State.FLATS else "Sharps"
-        self.switch.update()
-        self.cb_change(self.state)
+        await self.switch.update_async()
+        await self.cb_change(self.state)
@@ -1,24 +1,42 @@
-from typing import Callable
+from typing import Callable, Optional
 
 import flet as ft
 
+from src.core.circle_state import Spelling
+from src.core.pitch_class_set import PitchClassSet
 from src.core.tone import Tone
+from src.ui.update_batch import UpdateBatch, batched
 
 
 class ToneColumn(ft.UserControl):
 
-    def __init__(self, cb_change: Callable):
+    def __init__(
+            self,
+            cb_change: Callable,
+            batch: Optional[UpdateBatch] = None,
+            spelling: Spelling = Spelling.FLATS
+    ) -> None:
+
         super(ToneColumn, self).__init__()
         self.cb_change = cb_change
+        self._batch = batch or UpdateBatch(deferred=True)
+        self._spelling = spelling
 
     @property
     def checkboxes(self) -> list[ft.Checkbox]:
         return self.controls[0].controls
 
+    @property
+    def selection(self) -> PitchClassSet:
+        return PitchClassSet.of(cb.data for cb in self.checkboxes if cb.value)
+
+    def batch(self) -> UpdateBatch:
+        return self._batch
+
     def build(self) -> ft.Column:
         checkboxes = [
             ft.Checkbox(
-                label=tone.flat_name,
+                label=self._label(tone),
                 data=tone,
                 on_change=self._on_change
             )
@@ -26,17 +44,27 @@ class ToneColumn(ft.UserControl):
         ]
         return ft.Column(checkboxes, spacing=0)
 
+    @batched
     def set_sharps(self) -> None:
-        for checkbox in self.checkboxes:
-            tone = checkbox.data
-            checkbox.label = tone.sharp_name
-            checkbox.update()
+        self._set_spelling(Spelling.SHARPS)
 
+    @batched
     def set_flats(self) -> None:
+        self._set_spelling(Spelling.FLATS)
+
+    def _set_spelling(self, spelling: Spelling) -> None:
+        self._spelling = spelling
+        # До build() подписи возьмутся из self._spelling
+        if not self.controls:
+            return
         for checkbox in self.checkboxes:
-            tone = checkbox.data
-            checkbox.label = tone.flat_name
-            checkbox.update()
+            label = self._label(checkbox.data)
+            if checkbox.label != label:
+                checkbox.label = label
+                self._batch.add(checkbox)
+
+    def _label(self, tone: Tone) -> str:
+        return tone.sharp_name if self._spelling == Spelling.SHARPS else tone.flat_name
 
-    def _on_change(self, e: ft.ControlEvent):
-        self.cb_change([cb.data for cb in self.checkboxes if cb.value])
+    async def _on_change(self, e: ft.ControlEvent):
+        await self.cb_change(self.selection)
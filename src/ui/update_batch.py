@@ -0,0 +1,134 @@
+from __future__ import annotations
+from functools import wraps
+from typing import Callable, Optional, Protocol
+
+import flet as ft
+
+from src.utils.instrumentation import REGISTRY
+
+
+class DirtySource(Protocol):
+
+    def dirty_controls(self) -> list[ft.Control]:
+        ...
+
+
+class UpdateBatch:
+
+    # Собирает измененные контролы и отправляет их одним page.update(*dirty)
+    # при выходе из самого внешнего with-блока.
+    # В отложенном режиме (для async-приложения) отправку делает await flush_async()
+    def __init__(self, deferred: bool = False):
+        self.deferred = deferred
+        self._depth = 0
+        self._dirty: dict[int, ft.Control] = {}
+        self._sources: dict[int, DirtySource] = {}
+        self._origin: Optional[str] = None  # точка входа, к которой относятся изменения
+        self._interaction_messages = 0
+        self.messages_sent = 0
+        self.last_interaction_messages = 0
+
+    def __enter__(self) -> UpdateBatch:
+        if self._depth == 0:
+            self._interaction_messages = 0
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self._depth -= 1
+        if self._depth == 0 and not self.deferred:
+            self.flush()
+            self.last_interaction_messages = self._interaction_messages
+
+    @property
+    def pending(self) -> int:
+        # Контролы и источники, ожидающие отправки
+        return len(self._dirty) + len(self._sources)
+
+    def add(self, *controls: ft.Control) -> None:
+        if REGISTRY.enabled and self._origin is None:
+            self._origin = REGISTRY.current
+        for control in controls:
+            self._dirty[id(control)] = control
+        if self._depth == 0 and not self.deferred:
+            self.flush()
+
+    def add_source(self, source: DirtySource) -> None:
+        # Источник сам решает, какие контролы отправлять, в момент сброса
+        if REGISTRY.enabled and self._origin is None:
+            self._origin = REGISTRY.current
+        self._sources[id(source)] = source
+        if self._depth == 0 and not self.deferred:
+            self.flush()
+
+    def flush(self) -> None:
+        controls = self._collect()
+        origin, self._origin = self._origin, None
+        if not controls:
+            return
+        if not REGISTRY.enabled:
+            sent = self._send(controls)
+        else:
+            outer, REGISTRY.current = REGISTRY.current, origin
+            try:
+                sent = self._send(controls)
+            finally:
+                REGISTRY.current = outer
+            if sent:
+                REGISTRY.record_update(origin, sent)
+        if sent:
+            self.messages_sent += 1
+            self._interaction_messages += 1
+
+    async def flush_async(self) -> None:
+        controls = self._collect()
+        origin, self._origin = self._origin, None
+        sent = 0
+        if controls and not REGISTRY.enabled:
+            sent = await self._send_async(controls)
+        elif controls:
+            # REGISTRY.current своя у каждой задачи: другие сессии во время await ее не видят
+            outer, REGISTRY.current = REGISTRY.current, origin
+            try:
+                sent = await self._send_async(controls)
+            finally:
+                REGISTRY.current = outer
+            if sent:
+                REGISTRY.record_update(origin, sent)
+        if sent:
+            self.messages_sent += 1
+        self.last_interaction_messages = int(bool(sent))
+
+    def _collect(self) -> list[ft.Control]:
+        for source in self._sources.values():
+            for control in source.dirty_controls():
+                self._dirty[id(control)] = control
+        self._sources.clear()
+
+        controls = list(self._dirty.values())
+        self._dirty.clear()
+        return controls
+
+    def _send(self, controls: list[ft.Control]) -> int:
+        # Возвращает количество отправленных контролов.
+        # Еще не добавленные на страницу контролы отправятся вместе с ней
+        controls = [c for c in controls if c.page is not None]
+        if controls:
+            controls[0].page.update(*controls)
+        return len(controls)
+
+    async def _send_async(self, controls: list[ft.Control]) -> int:
+        controls = [c for c in controls if c.page is not None]
+        if controls:
+            await controls[0].page.update_async(*controls)
+        return len(controls)
+
+
+def batched(method: Callable) -> Callable:
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.batch():
+            return method(self, *args, **kwargs)
+
+    return wrapper
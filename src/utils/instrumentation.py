@@ -0,0 +1,154 @@
+from __future__ import annotations
+import json
+import os
+import sys
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Callable, Optional
+
+
+class CallStats:
+
+    __slots__ = ("calls", "seconds", "controls", "messages", "payload_bytes")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.controls = 0
+        self.messages = 0
+        self.payload_bytes = 0
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+# Текущая точка входа своя у каждой задачи asyncio: отправка одной сессии,
+# ожидающая ответа сервера, не видит точку входа другой
+_CURRENT: ContextVar[Optional[str]] = ContextVar("circle_entry", default=None)
+
+
+class Registry:
+
+    # Счетчики по точкам входа. Выключенный реестр стоит одной проверки флага на вызов.
+    # Обновления контролов приписываются самому внешнему вызову, который их вызвал
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._stats: dict[str, CallStats] = {}
+
+    @property
+    def current(self) -> Optional[str]:
+        return _CURRENT.get()
+
+    @current.setter
+    def current(self, name: Optional[str]) -> None:
+        _CURRENT.set(name)
+
+    def stats(self, name: str) -> CallStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = CallStats()
+        return stats
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def record_call(self, name: str, seconds: float) -> None:
+        stats = self.stats(name)
+        stats.calls += 1
+        stats.seconds += seconds
+
+    def record_update(self, name: Optional[str], controls: int) -> None:
+        stats = self.stats(name or "unattributed")
+        stats.controls += controls
+        stats.messages += 1
+
+    def record_payload(self, name: Optional[str], size: int) -> None:
+        self.stats(name or "unattributed").payload_bytes += size
+
+    def to_dict(self) -> dict[str, dict]:
+        return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2)
+
+    def to_prometheus(self) -> str:
+        metrics = (
+            ("calls", "counter", "Number of calls"),
+            ("seconds", "counter", "Wall time spent in calls"),
+            ("controls", "counter", "Controls sent to the client"),
+            ("messages", "counter", "Update messages sent to the client"),
+            ("payload_bytes", "counter", "Update payload size")
+        )
+        lines = []
+        for field, kind, help_text in metrics:
+            metric = f"circle_{field}_total"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {kind}")
+            for name, stats in sorted(self._stats.items()):
+                lines.append(f'{metric}{{entry="{name}"}} {getattr(stats, field)}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str) -> None:
+        # Формат по расширению: .prom - Prometheus, иначе JSON
+        text = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+
+
+REGISTRY = Registry(enabled=os.environ.get("CIRCLE_METRICS") == "1")
+
+
+def instrumented(name: str) -> Callable:
+
+    def decorator(method: Callable) -> Callable:
+
+        @wraps(method)
+        def wrapper(*args, **kwargs):
+            registry = REGISTRY
+            if not registry.enabled:
+                return method(*args, **kwargs)
+            outer = registry.current
+            if outer is None:
+                registry.current = name
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                registry.record_call(name, time.perf_counter() - start)
+                registry.current = outer
+
+        return wrapper
+
+    return decorator
+
+
+def page_connection(page):
+    # У Page во Flet 0.20 нет публичного доступа к соединению; поле может исчезнуть в других версиях
+    connection = getattr(page, "connection", None) or getattr(page, "_Page__conn", None)
+    if connection is None or not hasattr(connection, "send_commands_async"):
+        return None
+    return connection
+
+
+def instrument_connection(connection) -> None:
+    # Размер реально отправленных команд: оборачивает отправку у соединения страницы.
+    # Команды сериализуются второй раз, поэтому делается только при включенном реестре
+    if not REGISTRY.enabled or getattr(connection, "_circle_instrumented", False):
+        return
+    if connection is None:
+        print("warning: page connection not found, payload_bytes will stay at 0", file=sys.stderr)
+        return
+    from flet_core.protocol import CommandEncoder
+
+    send_commands_async = connection.send_commands_async
+
+    async def wrapper(session_id, commands):
+        REGISTRY.record_payload(
+            REGISTRY.current,
+            len(json.dumps(commands, cls=CommandEncoder, separators=(",", ":")))
+        )
+        return await send_commands_async(session_id, commands)
+
+    connection.send_commands_async = wrapper
+    connection._circle_instrumented = True
@@ -0,0 +1,39 @@
+from __future__ import annotations
+import math
+from functools import lru_cache
+
+from src.utils.lazy import lazy_import
+
+np = lazy_import("numpy")
+
+
+@lru_cache(maxsize=None)
+def ring_layout(
+    center: tuple[float, float],
+    radii: tuple[float, ...],
+    n: int  # Количество позиций на кольце
+) -> np.ndarray:
+    # Центры позиций всех колец за один проход: массив (кольцо, позиция, (top, left)).
+    # Позиция 0 - верх круга, дальше против часовой стрелки
+    top0, left0 = center
+    phi = 2 * np.pi / n * (np.arange(n) + n / 2)
+    r = np.asarray(radii, dtype=float)[:, np.newaxis]
+    coords = np.stack([top0 + r * np.cos(phi), left0 + r * np.sin(phi)], axis=-1)
+    coords.flags.writeable = False
+    return coords
+
+
+@lru_cache(maxsize=None)
+def ring_centers(
+    center: tuple[float, float],
+    radii: tuple[float, ...],
+    n: int
+) -> tuple[tuple[tuple[float, float], ...], ...]:
+    # То же, что ring_layout, но неизменяемыми кортежами - общими для всех сессий.
+    # Считается без NumPy: это несколько десятков точек, а NumPy не нужен на старте
+    top0, left0 = center
+    phis = [2 * math.pi / n * (i + n / 2) for i in range(n)]
+    return tuple(
+        tuple((top0 + r * math.cos(phi), left0 + r * math.sin(phi)) for phi in phis)
+        for r in map(float, radii)
+    )
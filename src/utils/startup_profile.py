@@ -0,0 +1,91 @@
+from __future__ import annotations
+import sys
+import time
+from typing import Optional
+
+from src.utils.timing import PhaseTimer
+
+
+class _TimedLoader:
+
+    def __init__(self, loader, name: str, profiler: ImportProfiler):
+        self._loader = loader
+        self._name = name
+        self._profiler = profiler
+
+    def __getattr__(self, item):
+        return getattr(self._loader, item)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module) -> None:
+        # После загрузки модулю возвращается настоящий загрузчик
+        module.__loader__ = self._loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self._loader
+        self._profiler.begin()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler.end(self._name)
+
+
+class ImportProfiler:
+
+    # Замер импорта модулей в духе python -X importtime:
+    # собственное и накопленное время загрузки каждого модуля в микросекундах
+    def __init__(self):
+        self._stack: list[tuple[float, float]] = []  # (начало, время вложенных импортов)
+        self.records: list[tuple[int, int, int, str]] = []  # (глубина, self, cumulative, имя)
+
+    @classmethod
+    def install(cls) -> ImportProfiler:
+        profiler = cls()
+        sys.meta_path.insert(0, profiler)
+        return profiler
+
+    def uninstall(self) -> None:
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, name, path=None, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimedLoader(spec.loader, name, self)
+            return spec
+        return None
+
+    def begin(self) -> None:
+        self._stack.append((time.perf_counter(), 0.0))
+
+    def end(self, name: str) -> None:
+        start, children = self._stack.pop()
+        cumulative = time.perf_counter() - start
+        if self._stack:
+            parent_start, parent_children = self._stack[-1]
+            self._stack[-1] = (parent_start, parent_children + cumulative)
+        self.records.append((
+            len(self._stack),
+            round((cumulative - children) * 1e6),
+            round(cumulative * 1e6),
+            name
+        ))
+
+    def report(self, phases: Optional[PhaseTimer] = None) -> str:
+        lines = ["import time: self [us] | cumulative | imported package"]
+        for depth, self_us, cumulative_us, name in self.records:
+            lines.append(f"import time: {self_us:>9} | {cumulative_us:>10} | {'  ' * depth} {name}")
+        if phases is not None:
+            lines.append("")
+            lines.extend(f"phase: {line}" for line in phases.report().splitlines())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str, phases: Optional[PhaseTimer] = None) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.report(phases))
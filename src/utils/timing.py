@@ -0,0 +1,30 @@
+from __future__ import annotations
+import time
+from typing import Optional
+
+
+class PhaseTimer:
+
+    # Последовательные фазы: mark(name) закрывает фазу, начатую предыдущей отметкой
+    def __init__(self, start: Optional[float] = None):
+        self._last = time.perf_counter() if start is None else start
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> float:
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+        return self.phases[phase]
+
+    def record(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = seconds
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def report(self) -> str:
+        width = max([len(phase) for phase in self.phases] + [len("total")])
+        lines = [f"{phase:<{width}} {seconds * 1000:8.1f} ms" for phase, seconds in self.phases.items()]
+        lines.append(f"{'total':<{width}} {self.total * 1000:8.1f} ms")
+        return "\n".join(lines)
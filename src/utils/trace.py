@@ -0,0 +1,81 @@
+from __future__ import annotations
+import json
+import os
+import time
+from typing import IO, Iterator, Optional, Union
+
+# Журнал действий пользователя, по строке JSON на событие: [мс от начала, вид, значение].
+# Первая строка - заголовок "g": список дополнительных колец круга (--rings), от него
+# зависит нумерация аккордов. Виды событий: "c" - клик по аккорду (индекс в model.chords:
+# 0..23 - основные кольца, дальше дополнительные), "m" - режим (имя Mode),
+# "s" - написание (имя Spelling), "t" - маска выбранных нот, "r" - размер круга
+RINGS = "g"
+CLICK = "c"
+MODE = "m"
+SPELLING = "s"
+TONES = "t"
+RESIZE = "r"
+
+KINDS = (RINGS, CLICK, MODE, SPELLING, TONES, RESIZE)
+
+Event = tuple[float, str, Union[int, float, str, list[str]]]
+
+
+class TraceRecorder:
+
+    # Пишет события сессии построчно, чтобы журнал не терялся при обрыве соединения
+    def __init__(self, path: str, rings: tuple[str, ...] = ()):
+        self._file: Optional[IO[str]] = open(path, "a", encoding="utf-8", buffering=1)
+        self._start = time.perf_counter()
+        self.events_recorded = 0
+        self._write(0.0, RINGS, list(rings))
+
+    def record(self, kind: str, value: Union[int, float, str]) -> None:
+        if self._file is None:
+            return
+        self._write(round((time.perf_counter() - self._start) * 1000, 1), kind, value)
+        self.events_recorded += 1
+
+    def _write(self, elapsed: float, kind: str, value) -> None:
+        self._file.write(json.dumps([elapsed, kind, value], separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def read_trace(path: str) -> list[Event]:
+    with open(path, encoding="utf-8") as f:
+        return list(_parse(f))
+
+
+def read_traces(paths: list[str]) -> dict[str, list[Event]]:
+    # Файлы и каталоги с файлами *.jsonl
+    traces = {}
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.endswith(".jsonl"):
+                    traces[os.path.join(path, name)] = read_trace(os.path.join(path, name))
+        else:
+            traces[path] = read_trace(path)
+    return traces
+
+
+def rings_of(events: list[Event]) -> tuple[str, ...]:
+    # Дополнительные кольца из заголовка; у журналов без заголовка их нет
+    for _, kind, value in events:
+        if kind == RINGS:
+            return tuple(value)
+    return ()
+
+
+def _parse(lines: IO[str]) -> Iterator[Event]:
+    for number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        elapsed, kind, value = json.loads(line)
+        if kind not in KINDS:
+            raise ValueError(f"line {number}: unknown event kind {kind!r}")
+        yield elapsed, kind, value
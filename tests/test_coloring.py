@@ -0,0 +1,54 @@
+# Сверка COLORING_TABLE с таблицами, которые раньше были прописаны
+# в Circle.paint_common / Circle.paint_negative вручную
+from collections import deque
+
+import pytest
+
+from src.core import colors as c
+from src.core.chord import MajorTriad
+from src.core.coloring import COLORING_TABLE, CIRCLE, MAJOR_CIRCLE, MINOR_CIRCLE, Coloring
+
+
+# (режим, главный аккорд мажорный?) -> (цвета внешнего кольца, цвета внутреннего кольца)
+# при главном аккорде на верхней позиции
+FIXTURES = {
+    (Coloring.COMMON, True): (
+        [c.BLACK, c.RED_300, c.BLUE_GREY_200, c.RED_300, c.RED_300, c.BLUE_GREY_200,
+         c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_300, c.RED_300, c.BLUE_GREY_200, c.RED_300],
+        [c.RED_600, c.BLUE_GREY_200, c.RED_300, c.RED_600, c.RED_300, c.BLUE_GREY_200,
+         c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_300, c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_600]
+    ),
+    (Coloring.COMMON, False): (
+        [c.RED_600, c.RED_600, c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_300, c.BLUE_GREY_200,
+         c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_300, c.RED_600, c.RED_300, c.BLUE_GREY_200],
+        [c.BLACK, c.RED_300, c.BLUE_GREY_200, c.RED_300, c.RED_300, c.BLUE_GREY_200,
+         c.BLUE_GREY_200, c.BLUE_GREY_200, c.RED_300, c.RED_300, c.BLUE_GREY_200, c.RED_300]
+    ),
+    (Coloring.NEGATIVE, True): (
+        [c.BLACK, c.BLUE_800, c.BLUE_400, c.GREY_700, c.GREEN_400, c.RED_400,
+         c.PURPLE_400, c.ORANGE_400, c.ORANGE_800, c.PURPLE_800, c.RED_800, c.GREEN_800],
+        [c.GREY_700, c.BLUE_400, c.BLUE_800, c.BLACK, c.GREEN_800, c.RED_800,
+         c.PURPLE_800, c.ORANGE_800, c.ORANGE_400, c.PURPLE_400, c.RED_400, c.GREEN_400]
+    ),
+    (Coloring.NEGATIVE, False): (
+        [c.GREY_700, c.GREEN_400, c.RED_400, c.PURPLE_400, c.ORANGE_400, c.ORANGE_800,
+         c.PURPLE_800, c.RED_800, c.GREEN_800, c.BLACK, c.BLUE_800, c.BLUE_400],
+        [c.BLACK, c.GREEN_800, c.RED_800, c.PURPLE_800, c.ORANGE_800, c.ORANGE_400,
+         c.PURPLE_400, c.RED_400, c.GREEN_400, c.GREY_700, c.BLUE_400, c.BLUE_800]
+    )
+}
+
+
+def expected_colors(coloring: Coloring, main) -> tuple[str, ...]:
+    major = isinstance(main, MajorTriad)
+    major_colors, minor_colors = map(deque, FIXTURES[(coloring, major)])
+    shift = (MAJOR_CIRCLE if major else MINOR_CIRCLE).index(main)
+    major_colors.rotate(shift)
+    minor_colors.rotate(shift)
+    return tuple(major_colors) + tuple(minor_colors)
+
+
+@pytest.mark.parametrize("coloring", list(Coloring), ids=lambda coloring: coloring.name)
+@pytest.mark.parametrize("chord", CIRCLE, ids=lambda chord: chord.sharp_name)
+def test_coloring_table(coloring: Coloring, chord) -> None:
+    assert COLORING_TABLE[(coloring, chord)] == expected_colors(coloring, chord)